@@ -6,28 +6,42 @@
 #
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
-from math import isnan
+from math import isnan, isinf
 
 from mo_dots import datas
 from mo_dots import lists
+from mo_dots.accessors import DataAccumulator, compile_adder, compile_getter, compile_setter, projector, select_paths
 from mo_dots.datas import *
+from mo_dots.datas import _atoms
 from mo_dots.fields import *
 from mo_dots.lists import *
 from mo_dots.nones import *
 from mo_dots.objects import DataObject, DataClass, object_to_data
+from mo_dots.records import Record, RecordView, SlotRecord, record_class
 from mo_dots.utils import *
 from mo_dots.utils import _null_types as null_types
 
 __all__ = [
     "coalesce",
+    "compile_adder",
+    "compile_getter",
+    "compile_setter",
     "concat_field",
+    "concat_fields",
     "Data",
+    "DataAccumulator",
     "DataClass",
+    "DataCursor",
     "DataObject",
     "dict_to_data",
     "endswith_field",
     "exists",
+    "field_cache_stats",
+    "FieldIndex",
     "FlatList",
+    "freeze",
+    "FrozenData",
+    "FrozenList",
     "from_data",
     "get_attr",
     "hash_value",
@@ -43,6 +57,7 @@ __all__ = [
     "is_primitive",
     "is_sequence",
     "join_field",
+    "join_fields",
     "last",
     "leaves",
     "leaves_to_data",
@@ -54,18 +69,34 @@ __all__ = [
     "NullType",
     "null_types",
     "object_to_data",
+    "parse_field",
+    "Path",
     "PATH_NOT_FOUND",
+    "PathTable",
+    "path_table",
+    "projector",
+    "read_only",
+    "ReadOnlyData",
+    "Record",
+    "record_class",
     "relative_field",
+    "relative_path",
     "register_data",
     "register_many",
     "register_list",
     "register_primitive",
     "register_type",
+    "select_paths",
     "set_attr",
     "set_default",
+    "set_field_cache_size",
     "split_field",
+    "SlotRecord",
+    "split_fields",
     "startswith_field",
     "tail_field",
+    "tail_path",
+    "thaw",
     "to_data",
     "tuplewrap",
     "unliteral_field",
@@ -190,6 +221,30 @@ def _getdefault(obj, key):
     key IS EXPECTED TO BE LITERAL (NO ESCAPING)
     TRY BOTH ATTRIBUTE AND ITEM ACCESS, OR RETURN Null
     """
+    kind = _lookup_kinds[_get(obj, CLASS)]
+    if kind is _DICT:
+        v = obj.get(key, _NOT_FOUND)
+        if v is not _NOT_FOUND:
+            return v
+        i = _int_key(key)
+        if i is not None:
+            v = obj.get(i, _NOT_FOUND)
+            if v is not _NOT_FOUND:
+                return v
+        return NullType(obj, key)
+    elif kind is _LIST:
+        if isinstance(key, int) and -len(obj) <= key < len(obj):
+            return obj[key]
+        return [_getdefault(o, key) for o in obj]
+    elif kind is _OBJECT:
+        try:
+            v = getattr(obj, key, _NOT_FOUND)
+        except Exception:
+            v = _NOT_FOUND
+        if v is _NOT_FOUND:
+            return NullType(obj, key)
+        return v
+
     try:
         return obj[key]
     except Exception as f:
@@ -218,6 +273,54 @@ def _getdefault(obj, key):
     return NullType(obj, key)
 
 
+# HOW TO LOOK INTO A CONTAINER, DECIDED BY TYPE SO ORDINARY MISSES DO NOT RAISE
+_DICT = "dict"  # EXACTLY dict: KEY, THEN INTEGER KEY
+_LIST = "list"  # EXACTLY list OR tuple: INDEX, OR BROADCAST TO ELEMENTS
+_OBJECT = "object"  # NO __getitem__: ATTRIBUTE ONLY
+_OTHER = "other"  # ANYTHING ELSE: TRY EVERYTHING
+_NOT_FOUND = object()
+
+
+def _classify_lookup(type_):
+    if type_ is dict:
+        return _DICT
+    elif type_ in (list, tuple):
+        return _LIST
+    elif (
+        hasattr(type_, "__getitem__")
+        or issubclass(type_, (type, _module_type))
+        or issubclass(type_, sequence_types)
+    ):
+        return _OTHER
+    else:
+        return _OBJECT
+
+
+_lookup_kinds = TypeDispatch(_classify_lookup)
+
+
+def _int_key(key):
+    """
+    RETURN key AS int, IF IT IS ONE, OTHERWISE None
+    """
+    _class = _get(key, CLASS)
+    if _class is int:
+        return key
+    elif _class is str:
+        end = key[-1:]
+        if not (end.isdigit() or end.isspace()):
+            return None
+        try:
+            return int(key)
+        except Exception:
+            return None
+    elif _class is float:
+        if isinf(key) or isnan(key) or key != round(key, 0):
+            return None
+        return int(key)
+    return None
+
+
 PATH_NOT_FOUND = "Path not found"
 AMBIGUOUS_PATH_FOUND = "Path is ambiguous"
 
@@ -228,7 +331,7 @@ def set_attr(obj, path, value):
     RETURN OLD VALUE
     """
     try:
-        return _set_attr(obj, split_field(path), value)
+        return _set_attr(obj, parse_field(path), value)
     except Exception as cause:
         Log = get_logger()
         if PATH_NOT_FOUND in cause:
@@ -242,7 +345,7 @@ def get_attr(obj, path):
     SAME AS object.__getattr__(), BUT USES DOT-DELIMITED path
     """
     try:
-        return _get_attr(obj, split_field(path))
+        return _get_attr(obj, parse_field(path))
     except Exception as cause:
         Log = get_logger()
         if PATH_NOT_FOUND in cause:
@@ -297,7 +400,34 @@ def _get_attr(obj, path):
         elif len(matched_attr_name) > 1:
             get_logger().error(AMBIGUOUS_PATH_FOUND + " {{paths}}", paths=attr_name)
         else:
-            return _get_attr(obj, matched_attr_name + path[1:])
+            return _get_attr(obj, (*matched_attr_name, *path[1:]))
+
+    kind = _lookup_kinds[_get(obj, CLASS)]
+    if kind is _DICT:
+        i = _int_key(attr_name)
+        if i is not None and i in obj:
+            return _get_attr(obj[i], path[1:])
+        if _get(attr_name, CLASS) is str and hasattr(dict, attr_name):
+            return _get_attr(getattr(obj, attr_name), path[1:])
+        v = obj.get(attr_name, _NOT_FOUND)
+        if v is _NOT_FOUND:
+            return NullType(obj, attr_name)
+        return _get_attr(v, path[1:])
+    elif kind is _LIST:
+        i = _int_key(attr_name)
+        if i is not None and -len(obj) <= i < len(obj):
+            return _get_attr(obj[i], path[1:])
+        if _get(attr_name, CLASS) is str and hasattr(_get(obj, CLASS), attr_name):
+            return _get_attr(getattr(obj, attr_name), path[1:])
+        return NullType(obj, attr_name)
+    elif kind is _OBJECT:
+        try:
+            v = getattr(obj, attr_name, _NOT_FOUND)
+        except Exception:
+            v = _NOT_FOUND
+        if v is _NOT_FOUND:
+            return NullType(obj, attr_name)
+        return _get_attr(v, path[1:])
 
     try:
         obj = obj[int(attr_name)]
@@ -363,23 +493,41 @@ def to_data(v=None) -> object:
     :return:  Data INSTANCE
     """
 
-    type_ = _get(v, CLASS)
-
-    if type_ in (dict, OrderedDict):
+    wrap = _data_wrappers[_get(v, CLASS)]
+    if wrap is None:
+        return v
+    elif wrap is dict_to_data:
         m = _new(Data)
         _set(m, SLOT, v)
         return m
+    return wrap(v)
+
+
+def _classify_data(type_):
+    """
+    RETURN HOW to_data() WRAPS AN INSTANCE OF type_, None FOR NO WRAPPING
+    """
+    if type_ in (dict, OrderedDict):
+        return dict_to_data
     elif type_ is none_type:
-        return Null
-    elif type_ is tuple:
-        return list_to_data(v)
-    elif type_ is list:
-        return list_to_data(v)
+        return _to_null
+    elif type_ in (tuple, list):
+        return list_to_data
     elif type_ in generator_types:
-        return list_to_data(list(from_data(vv) for vv in v))
+        return _generator_to_list
     else:
-        return v
+        return None
+
+
+def _to_null(v):
+    return Null
+
+
+def _generator_to_list(v):
+    return list_to_data(list(from_data(vv) for vv in v))
+
 
+_data_wrappers = TypeDispatch(_classify_data)
 
 wrap = to_data
 
@@ -393,6 +541,8 @@ def from_data(v):
     elif _type is Data:
         d = _get(v, SLOT)
         return d
+    elif _type is ReadOnlyData or _type is DataCursor:
+        return _get(v, SLOT)
     elif _type is FlatList:
         return _get(v, SLOT)
     elif _type is DataObject:
@@ -403,12 +553,78 @@ def from_data(v):
         if isnan(v):
             return None
         return v
+    elif _record_types[_type]:
+        return _type.to_dict(v)
     return v
 
 
+def _classify_record(type_):
+    return issubclass(type_, (Record, RecordView, SlotRecord))
+
+
+_record_types = TypeDispatch(_classify_record)
+
 unwrap = from_data
 
 
+def freeze(value):
+    """
+    RETURN IMMUTABLE, HASHABLE COPY OF value: dicts BECOME FrozenData, LISTS
+    BECOME FrozenList, AND sets BECOME frozenset.  ANYTHING ALREADY FROZEN, AND
+    PRIMITIVES, ARE SHARED, NOT COPIED
+    """
+    _class = _get(value, CLASS)
+    if _class in _atoms or _class in (FrozenData, FrozenList):
+        return value
+    elif _class in (Data, ReadOnlyData, DataCursor):
+        value = _get(value, SLOT)
+        _class = _get(value, CLASS)
+
+    if _class in null_types:
+        return None
+    elif _class in (dict, OrderedDict) or is_data(value):
+        output = {}
+        for k, v in value.items():
+            v = freeze(v)
+            if v is not None:
+                output[k] = v
+        m = _new(FrozenData)
+        _set(m, SLOT, output)
+        _set(m, "_hash", None)
+        return m
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(freeze(v) for v in value)
+    elif is_many(value):
+        if _class is FlatList:
+            value = _get(value, SLOT)
+        m = _new(FrozenList)
+        _set(m, SLOT, tuple(freeze(v) for v in value))
+        _set(m, "_hash", None)
+        return m
+    elif _class is float and isnan(value):
+        return None
+    return value
+
+
+def thaw(value):
+    """
+    RETURN MUTABLE COPY OF frozen value, AS Data OR FlatList
+    ONLY FROZEN OBJECTS ARE COPIED, EVERYTHING ELSE IS SHARED
+    """
+    return to_data(_thaw(value))
+
+
+def _thaw(value):
+    _class = _get(value, CLASS)
+    if _class is FrozenData:
+        return {k: _thaw(v) for k, v in _get(value, SLOT).items()}
+    elif _class is FrozenList:
+        return [_thaw(v) for v in _get(value, SLOT)]
+    elif _class is frozenset:
+        return set(_thaw(v) for v in value)
+    return value
+
+
 def listwrap(value):
     """
     PERFORMS THE FOLLOWING TRANSLATION
@@ -507,10 +723,13 @@ setattr(datas, "data_types", _DeferDataTypes())
 
 
 # EXPORT
+export("mo_dots.datas", freeze)
+export("mo_dots.lists", freeze)
 export("mo_dots.datas", to_data)
 export("mo_dots.datas", from_data)
 export("mo_dots.datas", coalesce)
 export("mo_dots.datas", _getdefault)
+export("mo_dots.datas", _int_key)
 export("mo_dots.datas", listwrap)
 
 export("mo_dots.lists", to_data)
@@ -521,6 +740,14 @@ export("mo_dots.lists", get_attr)
 export("mo_dots.nones", to_data)
 export("mo_dots.nones", get_attr)
 
+export("mo_dots.accessors", to_data)
+export("mo_dots.accessors", from_data)
+export("mo_dots.accessors", _getdefault)
+
+export("mo_dots.records", to_data)
+export("mo_dots.records", from_data)
+export("mo_dots.records", _getdefault)
+
 export("mo_dots.objects", to_data)
 export("mo_dots.objects", from_data)
 export("mo_dots.objects", get_attr)
@@ -0,0 +1,502 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import re
+from decimal import Decimal
+from fnmatch import translate
+from functools import lru_cache
+
+from mo_imports import expect
+
+from mo_dots.datas import Data
+from mo_dots.fields import Path, simple_split_field, parse_field, literal_field
+from mo_dots.lists import list_to_data
+from mo_dots.nones import Null, NullType
+from mo_dots.objects import object_to_data, get_keys
+from mo_dots.utils import CLASS, SLOT, is_null, is_many, is_missing, get_logger
+
+_getdefault, to_data, from_data = expect("_getdefault", "to_data", "from_data")
+
+_get = object.__getattribute__
+
+
+def compile_getter(path):
+    """
+    RETURN FUNCTION THAT DOES data[path], SPECIALIZED FOR path
+    PLAIN dicts ARE WALKED WITH dict.get(), EVERYTHING ELSE (LISTS,
+    OBJECTS, MISSING VALUES) FALLS BACK TO THE FULL Data.__getitem__ LOGIC
+
+    :param path: DOT-DELIMITED FIELD, OR Path
+    :return: FUNCTION(data) -> VALUE
+    """
+    if is_null(path):
+        return _null_getter
+
+    if _get(path, CLASS) is Path:
+        if not path:
+            return _self_getter
+        steps = path
+    elif path == ".":
+        return _self_getter
+    else:
+        path = str(path)
+        if path.find(".") < 0:
+            return _key_getter(path)
+        steps = simple_split_field(path)
+
+    plan = tuple((step, steps[i:]) for i, step in enumerate(steps))
+
+    def getter(data):
+        _class = _get(data, CLASS)
+        if _class is Data:
+            d = _get(data, SLOT)
+        elif _class is dict:
+            d = data
+        else:
+            return to_data(data)[path]
+
+        for step, rest in plan:
+            if _get(d, CLASS) is dict:
+                v = d.get(step)
+                if v is not None:
+                    d = v
+                    continue
+            return _get_steps(d, rest)
+        return to_data(d)
+
+    return getter
+
+
+def _key_getter(key):
+    def getter(data):
+        _class = _get(data, CLASS)
+        if _class is Data:
+            d = _get(data, SLOT)
+        elif _class is dict:
+            d = data
+        else:
+            return to_data(data)[key]
+
+        o = d.get(key)
+        if is_null(o):
+            return NullType(d, key)
+        return to_data(o)
+
+    return getter
+
+
+def _null_getter(data):
+    return Null
+
+
+def _self_getter(data):
+    return to_data(data)["."]
+
+
+def _get_steps(d, steps):
+    """
+    SAME AS THE Data.__getitem__ PATH WALK
+    """
+    for n in steps:
+        if _get(d, CLASS) is NullType:
+            d = NullType(d, n)  # OH DEAR, Null TREATS n AS PATH, NOT LITERAL
+        elif is_many(d):
+            d = [_getdefault(dd, n) for dd in d]
+        else:
+            d = _getdefault(d, n)  # EVERYTHING ELSE TREATS n AS LITERAL
+    return to_data(d)
+
+
+def compile_setter(path):
+    """
+    RETURN FUNCTION THAT DOES data[path] = value, SPECIALIZED FOR path
+    MISSING INTERMEDIATE dicts ARE CREATED IN ONE PASS, EVERYTHING ELSE
+    (LISTS, OBJECTS, None) FALLS BACK TO THE FULL Data.__setitem__ LOGIC
+
+    :param path: DOT-DELIMITED FIELD, OR Path
+    :return: FUNCTION(data, value) -> None
+    """
+    if path == "":
+        get_logger().error("key is empty string.  Probably a bad idea")
+    if is_null(path):
+        return _null_setter
+
+    if _get(path, CLASS) is Path:
+        steps = path
+    elif path == "." or "." not in path:
+        steps = (path,)
+    else:
+        steps = simple_split_field(path)
+
+    def generic(data, value):
+        to_data(data)[path] = value
+
+    if not steps or steps == (".",):
+        return generic
+
+    last = steps[-1]
+    parents = tuple((step, _is_number(step), steps[i + 1 : -1]) for i, step in enumerate(steps[:-1]))
+
+    def setter(data, value):
+        _class = _get(data, CLASS)
+        if _class is Data:
+            d = _get(data, SLOT)
+            if _get(d, CLASS) is not dict:
+                return generic(data, value)
+        elif _class is dict:
+            d = data
+        else:
+            return generic(data, value)
+
+        value = from_data(value)
+        for step, numeric, rest in parents:
+            v = d.get(step)
+            if _get(v, CLASS) is dict:
+                d = v
+                continue
+            if v is None and not numeric and step not in d:
+                # MISSING, SO MAKE THE REMAINING PATH
+                if is_null(value):
+                    return
+                child = d[step] = {}
+                for k in rest:
+                    d = child
+                    child = d[k] = {}
+                child[last] = value
+                return
+            return generic(data, value)
+
+        if is_null(value):
+            d.pop(last, None)
+        else:
+            d[last] = value
+
+    return setter
+
+
+def _null_setter(data, value):
+    pass
+
+
+_numbers = (int, float, Decimal)
+
+
+def compile_adder(path):
+    """
+    RETURN FUNCTION THAT DOES data[path] += amount, SPECIALIZED FOR path
+    NUMBERS ARE ADDED, LISTS ARE EXTENDED (OR APPENDED TO), AND MISSING
+    LEAVES (AND THEIR PARENTS) ARE CREATED, ALL ON THE PLAIN dicts.
+    EVERYTHING ELSE FALLS BACK TO THE FULL data[path] += amount LOGIC
+
+    :param path: DOT-DELIMITED FIELD, OR Path
+    :return: FUNCTION(data, amount) -> None
+    """
+    if path == "":
+        get_logger().error("key is empty string.  Probably a bad idea")
+    if is_null(path):
+        return _null_setter
+
+    if _get(path, CLASS) is Path:
+        steps = path
+    elif path == "." or "." not in path:
+        steps = (path,)
+    else:
+        steps = simple_split_field(path)
+
+    def generic(data, amount):
+        data = to_data(data)
+        data[path] += amount
+
+    if not steps or steps == (".",):
+        return generic
+
+    last = steps[-1]
+    parents = tuple((step, _is_number(step), steps[i + 1 : -1]) for i, step in enumerate(steps[:-1]))
+
+    def adder(data, amount):
+        _class = _get(data, CLASS)
+        if _class is Data:
+            d = _get(data, SLOT)
+            if _get(d, CLASS) is not dict:
+                return generic(data, amount)
+        elif _class is dict:
+            d = data
+        else:
+            return generic(data, amount)
+
+        for step, numeric, rest in parents:
+            v = d.get(step)
+            if _get(v, CLASS) is dict:
+                d = v
+                continue
+            if v is None and not numeric and step not in d:
+                # MISSING, SO MAKE THE REMAINING PATH
+                amount = from_data(amount)
+                if is_null(amount):
+                    return
+                child = d[step] = {}
+                for k in rest:
+                    d = child
+                    child = d[k] = {}
+                child[last] = amount
+                return
+            return generic(data, amount)
+
+        v = d.get(last)
+        v_class = _get(v, CLASS)
+        if v_class in _numbers and _get(amount, CLASS) in _numbers:
+            d[last] = v + amount
+        elif v_class is list:
+            if is_null(amount):
+                return
+            elif is_many(amount):
+                v.extend(from_data(amount))
+            else:
+                v.append(amount)
+        elif v is None and last not in d:
+            amount = from_data(amount)
+            if not is_null(amount):
+                d[last] = amount
+        else:
+            generic(data, amount)
+
+    return adder
+
+
+class DataAccumulator:
+    """
+    COUNTERS AND HISTOGRAMS OVER NESTED PATHS
+
+        acc = DataAccumulator()
+        acc.add("run.machine.os", 1)    # SAME AS acc.data.run.machine.os += 1
+        acc.add("errors", [error])      # SAME AS acc.data.errors += [error]
+
+    THE ADDER FOR EACH path IS COMPILED ONCE, SO REPEATED PATHS RUN AT
+    NEAR-dict SPEED
+    """
+
+    __slots__ = ["data", "_adders"]
+
+    def __init__(self, data=None):
+        self.data = Data() if data is None else to_data(data)
+        self._adders = {}
+
+    def add(self, path, amount=1):
+        adder = self._adders.get(path)
+        if adder is None:
+            adder = self._adders[path] = compile_adder(path)
+        adder(self.data, amount)
+        return self
+
+    def __repr__(self):
+        return f"DataAccumulator({self.data!r})"
+
+
+def _is_number(step):
+    """
+    RETURN True IF _getdefault() WOULD TRY step AS AN INDEX
+    """
+    try:
+        return float(step) == round(float(step), 0)
+    except Exception:
+        return False
+
+
+def projector(paths, as_data=False):
+    """
+    RETURN FUNCTION THAT PULLS ALL paths OUT OF A RECORD IN ONE WALK
+    PATHS WITH A COMMON PREFIX SHARE THE WORK OF WALKING THAT PREFIX
+
+    :param paths: LIST OF DOT-DELIMITED FIELDS, OR Path
+    :param as_data: RETURN Data (WITH THE paths SET) INSTEAD OF A tuple
+    :return: FUNCTION(record) -> tuple (SAME AS tuple(record[p] for p in paths))
+    """
+    paths = list(paths)
+    getters = tuple(compile_getter(p) for p in paths)
+
+    # TRIE OF {step: (ENDS HERE, CHILD TRIE, ALL BELOW)}
+    trie = {}
+    for i, path in enumerate(paths):
+        if is_null(path):
+            continue
+        if _get(path, CLASS) is Path:
+            steps = path
+        elif path == ".":
+            steps = ()
+        elif "." not in path:
+            steps = (path,)
+        else:
+            steps = simple_split_field(path)
+        if not steps:
+            continue
+        node = trie
+        for step in steps[:-1]:
+            node = node.setdefault(step, ([], {}, []))[1]
+        node.setdefault(steps[-1], ([], {}, []))[0].append(i)
+    plan = _plan(trie)
+    size = len(paths)
+
+    def project(record):
+        _class = _get(record, CLASS)
+        if _class is Data:
+            d = _get(record, SLOT)
+        elif _class is dict:
+            d = record
+        else:
+            d = None
+
+        if _get(d, CLASS) is dict:
+            output = [None] * size
+            _project(d, plan, output, record, getters)
+            for i, value in enumerate(output):
+                if value is None:
+                    # NOT COVERED BY THE TRIE
+                    output[i] = getters[i](record)
+            return tuple(output)
+        return tuple(g(record) for g in getters)
+
+    if not as_data:
+        return project
+
+    setters = tuple(compile_setter(p) for p in paths)
+
+    def project_data(record):
+        output = Data()
+        for s, v in zip(setters, project(record)):
+            s(output, v)
+        return output
+
+    return project_data
+
+
+def _plan(trie):
+    """
+    RETURN TRIE AS TUPLE OF (step, ENDS HERE, CHILD PLAN, ALL BELOW)
+    """
+    output = []
+    for step, (ends, child, _) in trie.items():
+        child_plan = _plan(child)
+        below = tuple(ends) + tuple(i for _, _, _, b in child_plan for i in b)
+        output.append((step, tuple(ends), child_plan, below))
+    return tuple(output)
+
+
+def _project(d, plan, output, record, getters):
+    for step, ends, child, below in plan:
+        v = d.get(step)
+        if v is None:
+            # MISSING, LET THE FULL LOGIC MAKE THE Null
+            for i in below:
+                output[i] = getters[i](record)
+            continue
+        if ends:
+            value = to_data(v)
+            for i in ends:
+                output[i] = value
+        if not child:
+            continue
+        if _get(v, CLASS) is dict:
+            _project(v, child, output, record, getters)
+        else:
+            for _, _, _, b in child:
+                for i in b:
+                    output[i] = getters[i](record)
+
+
+def select_paths(data, pattern, with_paths=True):
+    """
+    RETURN THE (path, value) PAIRS IN data WHERE path MATCHES pattern
+    `*` MATCHES ONE STEP, `**` MATCHES ANY NUMBER OF STEPS, AND GLOB
+    CHARACTERS MATCH WITHIN A STEP (`*.dur*`). SUBTREES THAT CAN NOT
+    MATCH ARE NOT VISITED. LIKE leaves(), LISTS ARE NOT ENTERED
+
+    :param data: THE TREE TO SEARCH
+    :param pattern: DOT-DELIMITED FIELD, USING literal_field() FOR DOTS IN KEYS
+    :param with_paths: False TO RETURN ONLY THE VALUES
+    :return: FlatList
+    """
+    matchers = _compile_pattern(pattern)
+    output = []
+    _select(from_data(data), matchers, _closure(matchers, (0,)), [], output, with_paths, set())
+    return list_to_data(output)
+
+
+@lru_cache(maxsize=1000)
+def _compile_pattern(pattern):
+    """
+    RETURN TUPLE OF STEP MATCHERS: `**`, OR FUNCTION(key) -> bool
+    """
+    output = []
+    for step in parse_field(pattern):
+        if step == "**":
+            output.append(step)
+        elif step == "*":
+            output.append(_any_step)
+        elif any(c in step for c in "*?["):
+            output.append(re.compile(translate(step), re.DOTALL).match)
+        else:
+            output.append(step.__eq__)
+    return tuple(output)
+
+
+def _any_step(key):
+    return True
+
+
+def _closure(matchers, states):
+    """
+    ADD THE STATES REACHED BY `**` MATCHING ZERO STEPS
+    """
+    output = []
+    for i in states:
+        while i not in output:
+            output.append(i)
+            if i < len(matchers) and matchers[i] == "**":
+                i += 1
+    return tuple(output)
+
+
+def _select(value, matchers, states, path, output, with_paths, seen):
+    if _get(value, CLASS) is dict:
+        children = value.items()
+    else:
+        obj = object_to_data(value)
+        if obj is value or is_many(value):
+            return
+        children = ((k, from_data(obj[literal_field(k)])) for k in get_keys(obj))
+
+    _id = id(value)
+    if _id in seen:
+        return
+    seen.add(_id)
+    end = len(matchers)
+    for key, child in children:
+        if is_missing(child):
+            continue
+        next_states = []
+        for i in states:
+            if i == end:
+                continue
+            matcher = matchers[i]
+            if matcher == "**":
+                next_states.append(i)
+            elif matcher(key):
+                next_states.append(i + 1)
+        if not next_states:
+            continue
+        next_states = _closure(matchers, next_states)
+        path.append(key)
+        if end in next_states:
+            if with_paths:
+                output.append((".".join(literal_field(k) for k in path), child))
+            else:
+                output.append(child)
+        if next_states != (end,):
+            _select(child, matchers, next_states, path, output, with_paths, seen)
+        path.pop()
+    seen.discard(_id)
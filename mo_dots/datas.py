@@ -6,39 +6,48 @@
 #
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
+from collections.abc import ItemsView, ValuesView
 from copy import copy, deepcopy
 from decimal import Decimal
+from heapq import nsmallest
+from math import isnan
 
 from mo_future import generator_types, MutableMapping, first
 from mo_imports import expect, export
 
 from mo_dots import utils
-from mo_dots.fields import split_field, literal_field, concat_field
+from mo_dots.fields import Path, parse_field, simple_split_field, literal_field, concat_field
 from mo_dots.nones import Null, NullType
 from mo_dots.utils import *
 
 (
     _getdefault,
+    _int_key,
     coalesce,
     listwrap,
     from_data,
     to_data,
     list_to_data,
     FlatList,
+    FrozenList,
     DataObject,
     get_keys,
     object_to_data,
+    freeze,
 ) = expect(
     "_getdefault",
+    "_int_key",
     "coalesce",
     "listwrap",
     "from_data",
     "to_data",
     "list_to_data",
     "FlatList",
+    "FrozenList",
     "DataObject",
     "get_keys",
     "object_to_data",
+    "freeze",
 )
 
 
@@ -74,10 +83,25 @@ class Data:
     __nonzero__ = __bool__
 
     def __contains__(self, item):
-        value = Data.__getitem__(self, item)
-        if is_data(value) or value:
-            return True
-        return False
+        d = _get(self, SLOT)
+        if _get(item, CLASS) is str and _get(d, CLASS) is dict and item != ".":
+            if item.find(".") < 0:
+                return _present(d.get(item))
+            # WALK PLAIN dicts WITHOUT WRAPPING, OR MAKING NullType ON A MISS
+            for n in simple_split_field(item):
+                if _get(d, CLASS) is not dict:
+                    break
+                v = d.get(n, _NOT_FOUND)
+                if v is _NOT_FOUND:
+                    if _int_key(n) is None:
+                        return False
+                    break
+                if v is None:
+                    break
+                d = v
+            else:
+                return _present(d)
+        return _present(Data.__getitem__(self, item))
 
     def __iter__(self):
         d = _get(self, SLOT)
@@ -89,40 +113,43 @@ class Data:
     def __getitem__(self, key):
         if is_null(key):
             return Null
-        if key == ".":
+        if _get(key, CLASS) is Path:
+            if not key:
+                return Data.__getitem__(self, ".")
+            seq = key
+        elif key == ".":
             output = _get(self, SLOT)
             if is_data(output):
                 return self
             else:
                 return output
+        else:
+            key = str(key)
+            if key.find(".") < 0:
+                d = _get(self, SLOT)
+                o = d.get(key)
+                if is_null(o):
+                    return NullType(d, key)
+                return to_data(o)
+            seq = simple_split_field(key)
 
-        key = str(key)
         d = _get(self, SLOT)
+        for n in seq:
+            if _get(d, CLASS) is NullType:
+                d = NullType(d, n)  # OH DEAR, Null TREATS n AS PATH, NOT LITERAL
+            elif is_many(d):
+                d = [_getdefault(dd, n) for dd in d]
+            else:
+                d = _getdefault(d, n)  # EVERYTHING ELSE TREATS n AS LITERAL
 
-        if key.find(".") >= 0:
-            seq = _split_field(key)
-            for n in seq:
-                if _get(d, CLASS) is NullType:
-                    d = NullType(d, n)  # OH DEAR, Null TREATS n AS PATH, NOT LITERAL
-                elif is_many(d):
-                    d = [_getdefault(dd, n) for dd in d]
-                else:
-                    d = _getdefault(d, n)  # EVERYTHING ELSE TREATS n AS LITERAL
-
-            return to_data(d)
-        else:
-            o = d.get(key)
-
-        if is_null(o):
-            return NullType(d, key)
-        return to_data(o)
+        return to_data(d)
 
     def __setitem__(self, key, value):
         if key == "":
             get_logger().error("key is empty string.  Probably a bad idea")
         if is_null(key):
             return Null
-        if key == ".":
+        if key == "." or (_get(key, CLASS) is Path and not key):
             # SOMETHING TERRIBLE HAPPENS WHEN value IS NOT A Mapping;
             # HOPEFULLY THE ONLY OTHER METHOD RUN ON self IS from_data()
             v = from_data(value)
@@ -131,16 +158,22 @@ class Data:
             _set(self, SLOT, v)
             return self
         try:
+            if _get(key, CLASS) is Path:
+                seq = key
+            elif "." not in key:
+                seq = (key,)
+            else:
+                seq = simple_split_field(key)
             d = _get(self, SLOT)
             value = from_data(value)
-            if "." not in key:
+            if len(seq) == 1:
+                key = seq[0]
                 if value is None:
                     d.pop(key, None)
                 else:
                     d[key] = value
                 return self
 
-            seq = _split_field(key)
             for k in seq[:-1]:
                 d = _getdefault(d, k)
             if is_null(value):
@@ -164,19 +197,14 @@ class Data:
     def __getattr__(self, key):
         d = _get(self, SLOT)
         v = d.get(key)
-        t = _get(v, CLASS)
 
         # OPTIMIZED to_data()
-        if t in (dict, OrderedDict):
-            return dict_to_data(v)
-        elif t in utils._null_types:
-            return NullType(d, key)
-        elif t is list:
-            return list_to_data(v)
-        elif t in generator_types:
-            return FlatList(list(from_data(vv) for vv in v))
-        else:
+        wrap = _attr_wrappers[_get(v, CLASS)]
+        if wrap is None:
             return v
+        elif wrap is NullType:
+            return NullType(d, key)
+        return wrap(v)
 
     def __setattr__(self, key, value):
         d = _get(self, SLOT)
@@ -256,6 +284,10 @@ class Data:
 
         if not is_data(other):
             return False
+        e = _raw(other)
+        if _get(e, CLASS) is dict:
+            return _dict_eq(d, e)
+
         e = other
         for k, v in d.items():
             if e.get(k) != v:
@@ -278,7 +310,7 @@ class Data:
 
     def items(self):
         d = _get(self, SLOT)
-        return [(k, to_data(v)) for k, v in d.items() if v != None or is_data(v)]
+        return DataItems(d)
 
     def leaves(self, prefix=None):
         """
@@ -294,22 +326,25 @@ class Data:
     def pop(self, key, default=Null):
         if is_null(key):
             return Null
-        if key == ".":
+        if _get(key, CLASS) is Path:
+            seq = key
+        elif key == ".":
             raise NotImplemented()
+        else:
+            key = str(key)
+            seq = simple_split_field(key) if key.find(".") >= 0 else (key,)
+        if not seq:
+            get_logger().error("can not pop the root path")
 
-        key = str(key)
         d = _get(self, SLOT)
-
-        if key.find(".") >= 0:
-            seq = _split_field(key)
-            for n in seq[:-1]:
-                if _get(d, CLASS) is NullType:
-                    d = NullType(d, n)  # OH DEAR, Null TREATS n AS PATH, NOT LITERAL
-                elif is_many(d):
-                    d = [_getdefault(dd, n) for dd in d]
-                else:
-                    d = _getdefault(d, n)  # EVERYTHING ELSE TREATS n AS LITERAL
-            key = seq[-1]
+        for n in seq[:-1]:
+            if _get(d, CLASS) is NullType:
+                d = NullType(d, n)  # OH DEAR, Null TREATS n AS PATH, NOT LITERAL
+            elif is_many(d):
+                d = [_getdefault(dd, n) for dd in d]
+            else:
+                d = _getdefault(d, n)  # EVERYTHING ELSE TREATS n AS LITERAL
+        key = seq[-1]
 
         o = d.get(key)
         if is_null(o):
@@ -322,11 +357,11 @@ class Data:
 
     def keys(self):
         d = _get(self, SLOT)
-        return set(d.keys())
+        return d.keys()
 
     def values(self):
         d = _get(self, SLOT)
-        return listwrap(list(d.values()))
+        return DataValues(d)
 
     def clear(self):
         get_logger().error("clear() not supported")
@@ -354,13 +389,16 @@ class Data:
         return to_data(deepcopy(d, memo))
 
     def __delitem__(self, key):
-        if "." not in key:
+        if _get(key, CLASS) is Path:
+            seq = key
+        elif "." not in key:
             d = _get(self, SLOT)
             d.pop(key, None)
             return
+        else:
+            seq = simple_split_field(key)
 
         d = _get(self, SLOT)
-        seq = _split_field(key)
         for k in seq[:-1]:
             d = d[k]
         d.pop(seq[-1], None)
@@ -395,6 +433,417 @@ MutableMapping.register(Data)
 register_data(Data)
 
 
+_NOT_FOUND = object()
+_truthy_types = (str, int, float, bool, list, tuple)
+
+
+def _present(v):
+    """
+    SAME AS is_data(to_data(v)) or bool(to_data(v)), WITHOUT WRAPPING
+    EMPTY VALUES COUNT AS ABSENT, BUT ANY dict (EVEN EMPTY) IS PRESENT
+    """
+    _class = _get(v, CLASS)
+    if _class is dict:
+        return True
+    elif _class in _truthy_types:
+        return bool(v)
+    value = to_data(v)
+    return is_data(value) or bool(value)
+
+
+def _raw(v):
+    """
+    RETURN THE dict OR list INSIDE A WRAPPER, WITHOUT CHECKS
+    """
+    _class = _get(v, CLASS)
+    if _class in _data_wrappers or isinstance(v, FlatList):
+        return _get(v, SLOT)
+    return v
+
+
+_atoms = (str, int, bool, bytes)  # NEVER CONTAINERS, SO HASHED AND CHECKED DIRECTLY
+
+
+def _absent(v):
+    """
+    RETURN True IF v COUNTS AS A MISSING VALUE: null, EMPTY, OR A dict OF ONLY
+    ABSENT VALUES (SEE "Null expands Python's None" IN THE README)
+    """
+    if v is None:
+        return True
+    _class = _get(v, CLASS)
+    if _class in _atoms:
+        return _class is str and not v
+    elif _class in _data_wrappers:
+        v = _get(v, SLOT)
+        _class = _get(v, CLASS)
+    if _class is dict:
+        for w in v.values():
+            if not _absent(w):
+                return False
+        return True
+    return is_missing(v)
+
+
+def _dict_eq(a, b):
+    """
+    EQUALITY OF TWO RAW dicts: AN ABSENT (null OR EMPTY) VALUE IS THE SAME AS A MISSING KEY
+    """
+    if a is b or a == b:
+        return True
+    size = 0
+    for k, v in a.items():
+        if _absent(v):
+            continue
+        size += 1
+        w = b.get(k)
+        if w is None or not _value_eq(v, w):
+            return False
+    if len(b) == size:
+        return True
+    # b HAS EXTRA KEYS, THEY MUST ALL BE ABSENT
+    return sum(1 for w in b.values() if not _absent(w)) == size
+
+
+def _value_eq(v, w):
+    if v is w:
+        return True
+    v, w = _raw(v), _raw(w)
+    v_class, w_class = _get(v, CLASS), _get(w, CLASS)
+    if v_class is dict and w_class is dict:
+        return _dict_eq(v, w)
+    elif v_class in (list, tuple) and w_class in (list, tuple):
+        if len(v) != len(w):
+            return False
+        for vv, ww in zip(v, w):
+            if not _value_eq(vv, ww):
+                return False
+        return True
+    elif is_null(w):
+        return is_null(v)
+    return v == w
+
+
+class DataItems(ItemsView):
+    """
+    LIVE, LAZY VIEW OF THE (key, value) PAIRS; A VALUE IS WRAPPED ONLY WHEN TOUCHED
+    KEYS WITH None VALUES ARE NOT ITERATED, NOR COUNTED BY len()
+    """
+
+    __slots__ = ["_wrap"]
+
+    def __init__(self, d, wrap=None):
+        ItemsView.__init__(self, d)
+        self._wrap = wrap
+
+    def __len__(self):
+        return sum(1 for v in self._mapping.values() if v != None or is_data(v))
+
+    def __iter__(self):
+        wrap = self._wrap or to_data
+        for k, v in self._mapping.items():
+            if v != None or is_data(v):
+                yield k, wrap(v)
+
+    def __contains__(self, item):
+        key, value = item
+        v = self._mapping.get(key)
+        if v is None:
+            return False
+        value = from_data(value)
+        return v is value or v == value
+
+    def __repr__(self):
+        return f"DataItems({list(self)!r})"
+
+
+class DataValues(ValuesView):
+    """
+    LIVE, LAZY VIEW OF THE VALUES; A VALUE IS WRAPPED ONLY WHEN TOUCHED
+    """
+
+    __slots__ = ["_wrap"]
+
+    def __init__(self, d, wrap=None):
+        ValuesView.__init__(self, d)
+        self._wrap = wrap
+
+    def __iter__(self):
+        wrap = self._wrap or to_data
+        for v in self._mapping.values():
+            yield wrap(v)
+
+    def __contains__(self, value):
+        value = from_data(value)
+        for v in self._mapping.values():
+            if v is value or v == value:
+                return True
+        return False
+
+    def __repr__(self):
+        return f"DataValues({list(self)!r})"
+
+
+def _classify_attr(t):
+    """
+    RETURN HOW Data.__getattr__ WRAPS AN INSTANCE OF t
+    None MEANS NO WRAPPING, NullType MEANS A MISSING VALUE
+    """
+    if t in (dict, OrderedDict):
+        return dict_to_data
+    elif t in utils._null_types:
+        return NullType
+    elif t is list:
+        return _list_to_data
+    elif t in generator_types:
+        return _generator_to_data
+    else:
+        return None
+
+
+def _list_to_data(v):
+    return list_to_data(v)
+
+
+def _generator_to_data(v):
+    return FlatList(list(from_data(vv) for vv in v))
+
+
+_attr_wrappers = TypeDispatch(_classify_attr)
+
+
+class ReadOnlyData(Data):
+    """
+    READ-ONLY VIEW OF A dict: A MISSING KEY RETURNS THE SHARED Null, SO A MISS
+    ALLOCATES NOTHING.  THE PRICE IS Null CAN NOT BE ASSIGNED THROUGH
+
+        doc = read_only(record)
+        doc.run.machine.os   # Null, NOT NullType(run, "machine")
+    """
+
+    __slots__ = []
+
+    def __getitem__(self, key):
+        if is_null(key):
+            return Null
+        if _get(key, CLASS) is Path:
+            if not key:
+                return self
+            seq = key
+        elif key == ".":
+            return self
+        else:
+            key = str(key)
+            seq = simple_split_field(key) if "." in key else (key,)
+
+        d = _get(self, SLOT)
+        for n in seq:
+            t = _get(d, CLASS)
+            if t is FrozenData:
+                d = _get(d, SLOT)
+            elif t is not dict:
+                # NOT SIMPLE, USE THE FULL LOGIC
+                return _read_only(Data.__getitem__(self, key))
+            d = d.get(n)
+            if d is None:
+                return Null
+        return _read_only(d)
+
+    def __getattr__(self, key):
+        d = _get(self, SLOT)
+        if _get(d, CLASS) is not dict:
+            return _read_only(Data.__getattr__(self, key))
+        return _read_only(d.get(key))
+
+    def get(self, key, default=Null):
+        v = ReadOnlyData.__getitem__(self, key)
+        if v is Null:
+            return default
+        return v
+
+    def items(self):
+        d = _get(self, SLOT)
+        return DataItems(d, _read_only)
+
+    def values(self):
+        d = _get(self, SLOT)
+        return DataValues(d, _read_only)
+
+    def __setitem__(self, key, value):
+        get_logger().error("can not set key={key} on read-only data", key=key)
+
+    def __setattr__(self, key, value):
+        get_logger().error("can not set key={key} on read-only data", key=key)
+
+    def __delitem__(self, key):
+        get_logger().error("can not delete key={key} from read-only data", key=key)
+
+    def __delattr__(self, key):
+        get_logger().error("can not delete key={key} from read-only data", key=key)
+
+    def pop(self, key, default=Null):
+        get_logger().error("can not pop key={key} from read-only data", key=key)
+
+    def setdefault(self, k, d=None):
+        get_logger().error("can not set key={key} on read-only data", key=k)
+
+    def clear(self):
+        get_logger().error("can not clear read-only data")
+
+    def __iadd__(self, other):
+        get_logger().error("can not add to read-only data")
+
+    def __ior__(self, other):
+        get_logger().error("can not coalesce into read-only data")
+
+    def __repr__(self):
+        return f"read_only({repr(_get(self, SLOT))})"
+
+
+register_data(ReadOnlyData)
+
+
+def read_only(value):
+    """
+    RETURN READ-ONLY VIEW OF value, WHERE A MISSING KEY RETURNS THE SHARED Null
+    """
+    if _get(value, CLASS) is Data:
+        value = _get(value, SLOT)
+    return _read_only(value)
+
+
+def _read_only(v):
+    t = _get(v, CLASS)
+    if t is dict:
+        m = _new(ReadOnlyData)
+        _set(m, SLOT, v)
+        return m
+    elif t in utils._null_types:
+        return Null
+    elif t is Data:
+        m = _new(ReadOnlyData)
+        _set(m, SLOT, _get(v, SLOT))
+        return m
+    return to_data(v)
+
+
+class DataCursor(Data):
+    """
+    Data THAT RE-TARGETS ITSELF TO EACH CHILD dict, INSTEAD OF ALLOCATING A
+    NEW WRAPPER ON EACH HOP.  ONLY FOR CHAINED ACCESS: EVERY REFERENCE TO THE
+    CURSOR SEES THE LAST dict VISITED, SO DO NOT HOLD ON TO INNER OBJECTS
+
+        cursor = DataCursor()
+        for r in rows:
+            cursor(r).run.machine.os
+    """
+
+    __slots__ = []
+
+    def __init__(self, data=None):
+        _set(self, SLOT, {} if data is None else from_data(data))
+
+    def __call__(self, data):
+        """
+        POINT THE CURSOR AT data, AND RETURN IT
+        """
+        if _get(data, CLASS) is not dict and is_data(data):
+            data = from_data(data)
+        _set(self, SLOT, data)
+        return self
+
+    def __getattr__(self, key):
+        d = _get(self, SLOT)
+        v = d.get(key)
+        t = _get(v, CLASS)
+        if t is dict:
+            _set(self, SLOT, v)
+            return self
+        wrap = _attr_wrappers[t]
+        if wrap is None:
+            return v
+        elif wrap is NullType:
+            return NullType(d, key)
+        return wrap(v)
+
+    def __getitem__(self, key):
+        if _get(key, CLASS) is str and key.find(".") < 0:
+            d = _get(self, SLOT)
+            v = d.get(key)
+            if _get(v, CLASS) is dict:
+                _set(self, SLOT, v)
+                return self
+        v = Data.__getitem__(self, key)
+        if _get(v, CLASS) is Data:
+            _set(self, SLOT, _get(v, SLOT))
+            return self
+        return v
+
+    def __repr__(self):
+        return f"DataCursor({repr(_get(self, SLOT))})"
+
+
+register_data(DataCursor)
+
+
+class FrozenData(ReadOnlyData):
+    """
+    IMMUTABLE Data, WITH A STRUCTURAL HASH COMPUTED ONCE, SO IT CAN BE A dict
+    KEY OR set MEMBER.  EQUAL TO ANY Data WITH THE SAME CONTENT.  SEE freeze()
+
+        groups = {}
+        for r in rows:
+            groups.setdefault(freeze(r.run.machine), []).append(r)
+    """
+
+    __slots__ = ["_hash"]
+
+    def __init__(self, *args, **kwargs):
+        if args:
+            raise Exception("only keywords are allowed, not " + args[0].__class__.__name__)
+        _set(self, SLOT, _get(freeze(kwargs), SLOT))
+        _set(self, "_hash", None)
+
+    def __hash__(self):
+        h = _get(self, "_hash")
+        if h is None:
+            h = hash_value(_get(self, SLOT))
+            _set(self, "_hash", h)
+        return h
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if _get(other, CLASS) is FrozenData:
+            if hash(self) != hash(other):
+                return False
+            return _dict_eq(_get(self, SLOT), _get(other, SLOT))
+        return Data.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not FrozenData.__eq__(self, other)
+
+    def _immutable(self, *args, **kwargs):
+        get_logger().error("can not change frozen data")
+
+    __setitem__ = __setattr__ = __delitem__ = __delattr__ = __iadd__ = __ior__ = _immutable
+    pop = setdefault = clear = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"freeze({repr(_get(self, SLOT))})"
+
+
+register_data(FrozenData)
+
+_data_wrappers = (Data, ReadOnlyData, DataCursor, FrozenData)  # HOLD A dict IN SLOT
+
+
 def leaves(value, prefix=None):
     """
     LIKE items() BUT RECURSIVE, AND ONLY FOR THE LEAVES (non dict) VALUES
@@ -424,23 +873,17 @@ def _leaves(parent, value, path):
 
     for k in get_keys(obj):
         try:
-            v = obj[literal_field(k)]
+            literal = literal_field(k)
+            v = obj[literal]
             if is_missing(v):
                 continue
-            kk = concat_field(parent, literal_field(k))
+            kk = concat_field(parent, literal)
             vv = object_to_data(v)
             yield from _leaves(kk, vv, path + (_id,))
         except Exception as cause:
             get_logger().error("Do not know how to handle", cause=cause)
 
 
-def _split_field(field):
-    """
-    SIMPLE SPLIT, NO CHECKS
-    """
-    return [k.replace("\b", ".") for k in field.replace("..", "\b").split(".")]
-
-
 def _iadd(self, other):
     """
     RECURSIVE ADDITION OF DATA PROPERTIES
@@ -503,13 +946,69 @@ def _iadd(self, other):
     return self
 
 
-def hash_value(v):
-    if is_many(v):
-        return hash_value(first(v))
-    elif is_data(v):
-        return hash_value(first(v.values()))
-    else:
+HASH_SAMPLE_SIZE = 16  # WIDER dicts AND LISTS ARE HASHED BY A SAMPLE OF THIS MANY
+_null_hash = hash(None)
+
+
+def hash_value(v, full=False):
+    """
+    STRUCTURAL HASH, CONSISTENT WITH Data.__eq__: dict KEYS ARE UNORDERED,
+    KEYS WITH null VALUES ARE IGNORED, AND LIST ORDER MATTERS.  WIDE VALUES
+    ARE HASHED BY A DETERMINISTIC SAMPLE: THE KEYS WITH THE SMALLEST HASH,
+    OR EVENLY SPACED ELEMENTS
+
+    :param v: THE VALUE TO HASH
+    :param full: True TO HASH EVERYTHING, NOT A SAMPLE
+    """
+    _class = _get(v, CLASS)
+    if _class in _atoms:
         return hash(v)
+    elif _class in (FrozenData, FrozenList) and not full:
+        return hash(v)  # CACHED
+    elif _class in _data_wrappers:
+        v = _get(v, SLOT)
+        _class = _get(v, CLASS)
+
+    if _class in utils._null_types:
+        return _null_hash
+    elif _class is dict or is_data(v):
+        return _hash_data(v, full)
+    elif isinstance(v, (set, frozenset)):
+        return hash(frozenset(hash_value(vv, full) for vv in v))
+    elif is_many(v):
+        return _hash_list(v, full)
+    elif _class is float and isnan(v):
+        return _null_hash
+    return hash(v)
+
+
+def _hash_data(d, full):
+    # SKIP THE SAME ABSENT VALUES AS _dict_eq()
+    if full or len(d) <= HASH_SAMPLE_SIZE:
+        return hash(frozenset([(k, hash_value(v, full)) for k, v in d.items() if not _absent(v)]))
+    items = [(k, v) for k, v in d.items() if not _absent(v)]
+    size = len(items)
+    if size > HASH_SAMPLE_SIZE:
+        items = nsmallest(HASH_SAMPLE_SIZE, items, key=_hash_key)
+        return hash((size, frozenset((k, hash_value(v)) for k, v in items)))
+    return hash(frozenset((k, hash_value(v)) for k, v in items))
+
+
+def _hash_key(item):
+    return hash(item[0])
+
+
+def _hash_list(v, full):
+    if isinstance(v, FlatList):
+        v = _get(v, SLOT)
+    elif not is_finite(v):
+        v = list(v)
+    n = len(v)
+    if not n:
+        return _null_hash  # EMPTY LIST IS NULL
+    elif full or n <= HASH_SAMPLE_SIZE:
+        return hash(tuple(hash_value(vv, full) for vv in v))
+    return hash((n,) + tuple(hash_value(v[i * n // HASH_SAMPLE_SIZE]) for i in range(HASH_SAMPLE_SIZE)))
 
 
 def dict_to_data(d):
@@ -544,8 +1043,8 @@ def _leaves_to_data(value):
         return value
 
     _class = _get(value, CLASS)
-    if _class in utils._data_types:
-        if _class is Data:
+    if is_data(value):
+        if _class in (Data, ReadOnlyData):
             value = from_data(value)
 
         output = {}
@@ -555,7 +1054,7 @@ def _leaves_to_data(value):
             if key == "":
                 get_logger().error("key is empty string.  Probably a bad idea")
 
-            seq = split_field(key)
+            seq = parse_field(key)
             if not seq:
                 if not output:
                     output = value
@@ -1,5 +1,6 @@
 import re
 import sys
+from functools import lru_cache
 
 from mo_future import generator_types, flatten
 from mo_imports import expect
@@ -17,13 +18,26 @@ ILLEGAL_DOTS = re.compile(r"[^.]\.(?:\.\.)+")  # ODD DOTS ARE NOT ALLOWED
 SPLIT_DOTS = re.compile(r"(?<!\.)\.(?!\.)")  # SINGLE DOTS
 UNESCAPE_DOTS = re.compile(r"\x08|(?:\.\.)")  # ENCODED DOTS
 
+FIELD_CACHE_SIZE = 10_000  # MAXIMUM NUMBER OF PARSED FIELDS TO REMEMBER
+
 
 def literal_field(field):
     """
     RETURN SAME WITH DOTS (`.`) ESCAPED
+    THE RESULT IS INTERNED, SO EQUAL FIELDS SHARE ONE STRING
     """
     try:
-        return ESCAPE_DOTS2.sub("..", ESCAPE_DOTS1.sub("\b", field))
+        output = _literals.get(field)
+        if output is None:
+            if "." not in field:
+                output = field
+            else:
+                output = ESCAPE_DOTS2.sub("..", ESCAPE_DOTS1.sub("\b", field))
+            if len(_literals) >= _max_literals:
+                _literals.clear()
+            if _max_literals:
+                _literals[field] = output
+        return output
     except Exception as e:
         get_logger().error("bad literal", e)
 
@@ -38,7 +52,20 @@ def unliteral_field(field):
     :param field: THE STRING TO DE-literal IZE
     :return: SIMPLER STRING
     """
-    return UNESCAPE_DOTS.sub(".", field)
+    output = _unliterals.get(field)
+    if output is None:
+        output = UNESCAPE_DOTS.sub(".", field)
+        if len(_unliterals) >= _max_literals:
+            _unliterals.clear()
+        if _max_literals:
+            _unliterals[field] = output
+    return output
+
+
+# INTERNED RESULTS OF literal_field() AND unliteral_field(), CLEARED WHEN FULL
+_literals = {}
+_unliterals = {}
+_max_literals = FIELD_CACHE_SIZE
 
 
 def tail_field(field):
@@ -49,26 +76,145 @@ def tail_field(field):
     if field == "." or is_missing(field):
         return ".", "."
     elif "." in field:
-        path = split_field(field)
-        if path[0].startswith("."):
-            return path[0], join_field(path[1:])
-        return literal_field(path[0]), join_field(path[1:])
+        first, rest = tail_path(_parse_field(field))
+        if first.startswith("."):
+            return first, join_field(rest)
+        return literal_field(first), join_field(rest)
     else:
         return field, "."
 
 
+def tail_path(path):
+    """
+    RETURN THE FIRST STEP IN path, ALONG WITH THE REMAINING Path
+    IN (first, rest) PAIR.  first IS None FOR THE ROOT PATH
+    RECURSIVE CODE CAN CARRY rest, INSTEAD OF RE-PARSING A STRING
+    """
+    if not path:
+        return None, _root
+    return path[0], tuple.__new__(Path, path[1:])
+
+
 def split_field(field):
     """
     RETURN field AS ARRAY OF DOT-SEPARATED FIELDS
     """
+    return list(_parse_field(field))
+
+
+def parse_field(field):
+    """
+    RETURN field AS A Path (TUPLE OF DOT-SEPARATED FIELDS)
+    THE RESULT IS CACHED, AND SHARED WITH OTHER CALLERS
+    """
+    if _get(field, CLASS) is Path:
+        return field
+    return _parse_field(field)
+
+
+class Path(tuple):
+    """
+    IMMUTABLE, PRE-PARSED FIELD: A TUPLE OF LITERAL (UNESCAPED) KEYS
+    ACCEPTED WHEREVER A DOT-DELIMITED FIELD IS, SO IT IS PARSED ONLY ONCE
+
+        path = Path("run.machine.os")
+        for r in rows:
+            r[path]
+    """
+
+    __slots__ = []
+
+    def __new__(cls, field=None):
+        if field is None:
+            return _root
+        _class = _get(field, CLASS)
+        if _class is Path:
+            return field
+        if _class is str:
+            return _parse_field(field)
+        # SEQUENCE OF LITERAL KEYS
+        return tuple.__new__(cls, field)
+
+    def __str__(self):
+        return join_field(self)
+
+    def __repr__(self):
+        return f"Path({join_field(self)!r})"
+
+
+_root = tuple.__new__(Path, ())
+
+
+def _split(field):
+    if "\b" not in field and ".." not in field:
+        # PLAIN DOTTED FIELD, NOTHING TO UNESCAPE
+        return tuple.__new__(Path, (k for k in field.split(".") if k))
     if ILLEGAL_DOTS.search(field):
         get_logger().error("Odd number of dots is not allowed")
     if field.startswith(".."):
         remainder = field.lstrip(".")
         back = len(field) - len(remainder) - 1
-        return [".."] * back + [UNESCAPE_DOTS.sub(".", k) for k in SPLIT_DOTS.split(remainder) if k]
+        return tuple.__new__(
+            Path, ("..",) * back + tuple(UNESCAPE_DOTS.sub(".", k) for k in SPLIT_DOTS.split(remainder) if k)
+        )
     else:
-        return [UNESCAPE_DOTS.sub(".", k) for k in SPLIT_DOTS.split(field) if k]
+        return tuple.__new__(Path, (UNESCAPE_DOTS.sub(".", k) for k in SPLIT_DOTS.split(field) if k))
+
+
+def simple_split_field(field):
+    """
+    SIMPLE SPLIT, NO CHECKS
+    RETURN field AS TUPLE, THE RESULT IS CACHED
+    """
+    if _get(field, CLASS) is Path:
+        return field
+    return _simple_parse_field(field)
+
+
+def _simple_split(field):
+    if "\b" not in field and ".." not in field:
+        return tuple(field.split("."))
+    return tuple(k.replace("\b", ".") for k in field.replace("..", "\b").split("."))
+
+
+_parse_field = lru_cache(maxsize=FIELD_CACHE_SIZE)(_split)
+_simple_parse_field = lru_cache(maxsize=FIELD_CACHE_SIZE)(_simple_split)
+
+
+def set_field_cache_size(size=FIELD_CACHE_SIZE):
+    """
+    SET THE NUMBER OF PARSED FIELDS TO REMEMBER (LEAST RECENTLY USED ARE EVICTED)
+    :param size: None FOR NO LIMIT, 0 TO DISABLE CACHING
+    """
+    global _parse_field, _simple_parse_field, _max_literals
+    _parse_field = lru_cache(maxsize=size)(_split)
+    _simple_parse_field = lru_cache(maxsize=size)(_simple_split)
+    _max_literals = sys.maxsize if size is None else size
+    _literals.clear()
+    _unliterals.clear()
+
+
+def field_cache_stats():
+    """
+    RETURN hits, misses AND size OF THE PARSED FIELD CACHES
+    AND THE size AND memory (BYTES) OF THE INTERNED LITERALS
+    """
+    output = {}
+    for name, cache in (("split", _parse_field), ("simple_split", _simple_parse_field)):
+        info = cache.cache_info()
+        output[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+    for name, interned in (("literal", _literals), ("unliteral", _unliterals)):
+        output[name] = {"size": len(interned), "max_size": _max_literals, "memory": _memory(interned)}
+    return output
+
+
+def _memory(interned):
+    total = sys.getsizeof(interned)
+    for k, v in list(interned.items()):
+        total += sys.getsizeof(k)
+        if v is not k:
+            total += sys.getsizeof(v)
+    return total
 
 
 def join_field(path):
@@ -81,6 +227,11 @@ def join_field(path):
     if not path:
         return "."
 
+    joined = ".".join(path)
+    if joined.count(".") == len(path) - 1:
+        # NO DOTS IN ANY STEP, NOTHING TO ESCAPE
+        return joined
+
     prefix = ""
     while True:
         try:
@@ -95,7 +246,118 @@ def join_field(path):
 
 
 def concat_field(*fields):
-    return join_field(flatten(split_field(f) for f in fields))
+    """
+    RETURN fields JOINED AS ONE PATH, A LEADING DOUBLE DOT (`..`) REFERS TO THE PARENT
+    WORKS ON THE ESCAPED STRINGS, SAME AS join_field(flatten(split_field(f) for f in fields))
+    """
+    up = 0  # NUMBER OF PARENT REFERENCES THAT COULD NOT BE RESOLVED
+    output = ""
+    empty = True  # NO STEPS AT ALL
+    for field in fields:
+        if "\b" not in field and ".." not in field:
+            # PLAIN DOTTED FIELD, ALREADY ESCAPED
+            step = field.strip(".")
+            if step:
+                output = output + "." + step if output else step
+                empty = False
+            continue
+        for step in _parse_field(field):
+            empty = False
+            if step == "..":
+                if output:
+                    output = _parent_field(output)
+                else:
+                    up += 1
+            else:
+                step = literal_field(step)
+                output = output + "." + step if output else step
+
+    if up:
+        return "." * (up + 1) + output
+    if empty:
+        return "."
+    return output  # STEPS THAT CANCEL OUT ARE "", LIKE join_field()
+
+
+def _parent_field(field):
+    """
+    RETURN ESCAPED field WITHOUT ITS LAST STEP
+    """
+    end = len(field)
+    while True:
+        i = field.rfind(".", 0, end)
+        if i == -1:
+            return ""
+        start = i
+        while start and field[start - 1] == ".":
+            start -= 1
+        if (i - start) % 2 == 0:
+            # ODD NUMBER OF DOTS, SO ONE IS THE SEPARATOR
+            return field[:i]
+        end = start
+
+
+def split_fields(fields):
+    """
+    RETURN LIST OF split_field() FOR EACH OF fields
+    WHEN NO FIELD IS ESCAPED, ONE SCAN OF ALL fields IS ENOUGH
+    OTHERWISE ONLY THE ESCAPED fields ARE PARSED
+    """
+    fields = list(fields)
+    buffer = "\n".join(fields)
+    if "\b" not in buffer and ".." not in buffer:
+        return [[k for k in f.split(".") if k] for f in fields]
+    return [
+        [k for k in f.split(".") if k] if "\b" not in f and ".." not in f else list(_parse_field(f))
+        for f in fields
+    ]
+
+
+def join_fields(paths):
+    """
+    RETURN LIST OF join_field() FOR EACH OF paths
+    EACH DISTINCT STEP IS ESCAPED ONCE
+    """
+    escaped = {}
+    output = []
+    for path in paths:
+        if _get(path, CLASS) in generator_types:
+            path = list(path)
+        if not path or ".." in path:
+            output.append(join_field(path))
+            continue
+        joined = ".".join(path)
+        if joined.count(".") == len(path) - 1:
+            output.append(joined)
+            continue
+        steps = []
+        for step in path:
+            literal = escaped.get(step)
+            if literal is None:
+                literal = escaped[step] = literal_field(step)
+            steps.append(literal)
+        output.append(".".join(steps))
+    return output
+
+
+def concat_fields(prefix, fields):
+    """
+    RETURN LIST OF concat_field(prefix, f) FOR EACH f IN fields
+    prefix IS RESOLVED ONCE, PLAIN fields ARE APPENDED AS ESCAPED STRINGS
+    """
+    joined = concat_field(prefix)
+    if not joined or joined.startswith("."):
+        # NO STEPS, OR REFERS ABOVE THE ROOT
+        return [concat_field(prefix, f) for f in fields]
+
+    output = []
+    for f in fields:
+        if "\b" not in f and ".." not in f:
+            step = f.strip(".")
+            output.append(joined + "." + step if step else joined)
+        else:
+            output.append(concat_field(joined, f))
+    return output
 
 
 def startswith_field(field, prefix):
@@ -137,20 +399,238 @@ def relative_field(field, parent):
     if parent == ".":
         return field
 
-    field_path = split_field(field)
-    parent_path = split_field(parent)
+    up, rest = _relative(_parse_field(field), _parse_field(parent))
+    tail = join_field(rest)
+    if not up:
+        return tail
+
+    dots = "." * up
+    if tail == ".":
+        return "." + dots
+    else:
+        return "." + dots + tail
+
+
+def relative_path(path, parent):
+    """
+    RETURN path WITH RESPECT TO parent, BOTH TUPLES OF STEPS
+    EACH STEP UP FROM parent IS A ".." STEP
+    """
+    up, rest = _relative(path, parent)
+    return tuple.__new__(Path, ("..",) * up + tuple(rest))
+
+
+def _relative(path, parent):
+    """
+    RETURN (up, rest) - NUMBER OF STEPS UP FROM parent, AND THE STEPS DOWN TO path
+    """
     common = 0
-    for f, p in _builtin_zip(field_path, parent_path):
+    for f, p in _builtin_zip(path, parent):
         if f != p:
             break
         common += 1
+    return max(0, len(parent) - common), path[common:]
 
-    tail = join_field(field_path[common:])
-    if len(parent_path) <= common:
-        return join_field(field_path[common:])
 
-    dots = "." * (len(parent_path) - common)
-    if tail == ".":
-        return "." + dots
-    else:
-        return "." + dots + tail
+class FieldIndex:
+    """
+    INDEX OF DOT-DELIMITED FIELDS, TO FIND THE FIELDS UNDER A PATH, OR
+    ENDING WITH A PATH, IN TIME PROPORTIONAL TO THE NUMBER FOUND
+    FIELDS ARE FOUND BY THEIR split_field() STEPS, THEN CHECKED WITH THE
+    STRING-BASED startswith_field() AND endswith_field(), SO THE ANSWERS
+    ARE THE SAME (A \b RIGHT AFTER THE prefix SEPARATES, BUT A STEP
+    STARTING WITH \b DOES NOT)
+    """
+
+    __slots__ = ["_prefixes", "_suffixes", "_split_prefixes", "_split_suffixes", "_size"]
+
+    def __init__(self, fields=None):
+        self._prefixes = {}  # TRIE OF STEPS, None KEY HOLDS THE FIELD
+        self._suffixes = {}  # TRIE OF REVERSED STEPS
+        # STEPS WITH AN ESCAPED DOT, BY THE PATH ENDING IN THE TEXT BEFORE (OR AFTER) THAT DOT
+        self._split_prefixes = {}
+        self._split_suffixes = {}
+        self._size = 0
+        for f in fields or []:
+            self.add(f)
+
+    def add(self, field):
+        path = _parse_field(field)
+        node = self._prefixes
+        for i, step in enumerate(path):
+            node = node.setdefault(step, {})
+            if "." in step:
+                for j, c in enumerate(step):
+                    if c == "." and j:
+                        self._split_prefixes.setdefault(path[:i] + (step[:j],), {})[step] = node
+        if None in node:
+            return
+        node[None] = field
+        self._size += 1
+
+        node = self._suffixes
+        rpath = tuple(reversed(path))
+        for i, step in enumerate(rpath):
+            node = node.setdefault(step, {})
+            if "." in step:
+                for j, c in enumerate(step):
+                    if c == "." and j < len(step) - 1:
+                        self._split_suffixes.setdefault(rpath[:i] + (step[j + 1 :],), {})[step] = node
+        node[None] = field
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, field):
+        node = _find(self._prefixes, _parse_field(field))
+        return node is not None and None in node
+
+    def __iter__(self):
+        output = []
+        _collect(self._prefixes, output)
+        return iter(output)
+
+    def descendants(self, prefix):
+        """
+        RETURN ALL FIELDS THAT startswith_field(field, prefix)
+        """
+        if prefix == None:
+            return []
+        if prefix.startswith("."):
+            return list(self) if prefix == "." else []
+        path = _parse_field(prefix)
+        output = []
+        node = _find(self._prefixes, path)
+        if node is not None:
+            _collect(node, output)
+        for node in self._split_prefixes.get(path, {}).values():
+            _collect(node, output)
+        return [f for f in output if startswith_field(f, prefix)]
+
+    def endswith(self, suffix):
+        """
+        RETURN ALL FIELDS THAT endswith_field(field, suffix)
+        """
+        if is_null(suffix):
+            return []
+        if suffix == ".":
+            return list(self)
+        rpath = tuple(reversed(_parse_field(suffix)))
+        output = []
+        node = _find(self._suffixes, rpath)
+        if node is not None:
+            _collect(node, output)
+        for node in self._split_suffixes.get(rpath, {}).values():
+            _collect(node, output)
+        return [f for f in output if endswith_field(f, suffix)]
+
+    def relative(self, parent):
+        """
+        RETURN dict FROM EACH DESCENDANT OF parent TO relative_field(field, parent)
+        """
+        return {f: relative_field(f, parent) for f in self.descendants(parent)}
+
+
+def _find(node, path):
+    for step in path:
+        node = node.get(step)
+        if node is None:
+            return None
+    return node
+
+
+def _collect(node, output):
+    for step, child in node.items():
+        if step is None:
+            output.append(child)
+        else:
+            _collect(child, output)
+
+
+class PathTable:
+    """
+    SYMBOL TABLE BETWEEN CANONICAL PATHS AND SMALL INTEGERS
+    ALSO INTERNS THE SETS OF PATHS (SHAPES) USED BY Record, SO RECORDS
+    WITH THE SAME PATHS SHARE ONE KEY STRUCTURE
+
+        table = PathTable()
+        i = table.id("run.machine.os")
+        table.field(i) == "run.machine.os"
+    """
+
+    __slots__ = ["_ids", "_paths", "_fields", "_shapes"]
+
+    def __init__(self):
+        self._ids = {}  # MAP FROM Path TO id
+        self._paths = []  # MAP FROM id TO Path
+        self._fields = []  # MAP FROM id TO ESCAPED FIELD
+        self._shapes = {}  # MAP FROM TUPLE OF SORTED ids TO Shape
+
+    def id(self, field):
+        """
+        RETURN THE INTEGER FOR field (str OR SEQUENCE OF KEYS), ADDING IT IF NEW
+        """
+        path = Path(field)
+        output = self._ids.get(path)
+        if output is None:
+            output = self._ids[path] = len(self._paths)
+            self._paths.append(path)
+            self._fields.append(join_field(path))
+        return output
+
+    def lookup(self, field):
+        """
+        RETURN THE INTEGER FOR field, OR None IF NOT IN TABLE
+        """
+        return self._ids.get(Path(field))
+
+    def path(self, id):
+        return self._paths[id]
+
+    def field(self, id):
+        return self._fields[id]
+
+    def shape(self, ids):
+        """
+        RETURN THE Shape FOR THE GIVEN SET OF PATH ids
+        EQUAL SETS RETURN THE SAME Shape, SO IT CAN BE COMPARED WITH `is`
+        """
+        ids = tuple(sorted(ids))
+        output = self._shapes.get(ids)
+        if output is None:
+            output = self._shapes[ids] = Shape(self, ids)
+        return output
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, field):
+        return Path(field) in self._ids
+
+
+class Shape:
+    """
+    INTERNED, SORTED SET OF PATH ids, WITH THE POSITION OF EACH
+    """
+
+    __slots__ = ["table", "ids", "index"]
+
+    def __init__(self, table, ids):
+        self.table = table
+        self.ids = ids
+        self.index = {id: i for i, id in enumerate(ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __hash__(self):
+        return hash(self.ids)
+
+    def __repr__(self):
+        return f"Shape({[self.table.field(i) for i in self.ids]!r})"
+
+
+path_table = PathTable()  # DEFAULT, GLOBAL, TABLE
@@ -13,15 +13,15 @@ from mo_imports import expect, delay_import, export
 
 from mo_dots import utils
 from mo_dots.datas import is_missing, hash_value
+from mo_dots.fields import Path
 from mo_dots.nones import Null, NullType
 from mo_dots.utils import CLASS, SLOT, is_null, is_many, is_list, is_sequence, register_list
 
 Log = delay_import("mo_logs.Log")
-object_to_data, coalesce, to_data, from_data, get_attr = expect(
-    "object_to_data", "coalesce", "to_data", "from_data", "get_attr"
+object_to_data, coalesce, to_data, from_data, get_attr, freeze = expect(
+    "object_to_data", "coalesce", "to_data", "from_data", "get_attr", "freeze"
 )
 
-_null_hash = hash(None)
 _get = object.__getattribute__
 _set = object.__setattr__
 _new = object.__new__
@@ -99,7 +99,7 @@ class FlatList:
         """
         simple `select`
         """
-        if key == ".":
+        if key == "." or (_get(key, CLASS) is Path and not key):
             output = []
             for v in _get(self, SLOT):
                 if is_many(v):
@@ -188,10 +188,7 @@ class FlatList:
             return to_data(_get(self, SLOT).pop(index))
 
     def __hash__(self):
-        lst = _get(self, SLOT)
-        if not lst:
-            return _null_hash
-        return hash_value(lst[0])
+        return hash_value(_get(self, SLOT))
 
     def __eq__(self, other):
         lst = _get(self, SLOT)
@@ -298,6 +295,52 @@ class FlatList:
 register_list(FlatList)
 
 
+class FrozenList(FlatList):
+    """
+    IMMUTABLE FlatList, WITH A STRUCTURAL HASH COMPUTED ONCE.  SEE freeze()
+    """
+
+    __slots__ = ["_hash"]
+
+    def __init__(self, vals=None):
+        _set(self, SLOT, _get(freeze(list(vals or [])), SLOT))
+        _set(self, "_hash", None)
+
+    def __hash__(self):
+        h = _get(self, "_hash")
+        if h is None:
+            h = hash_value(_get(self, SLOT))
+            _set(self, "_hash", h)
+        return h
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if _get(other, CLASS) is FrozenList:
+            if hash(self) != hash(other):
+                return False
+            return _get(self, SLOT) == _get(other, SLOT)
+        return FlatList.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not FrozenList.__eq__(self, other)
+
+    def _immutable(self, *args, **kwargs):
+        Log.error("can not change a frozen list")
+
+    __setitem__ = __setattr__ = __delitem__ = __iadd__ = _immutable
+    append = extend = remove = pop = clear = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"freeze({repr(list(_get(self, SLOT)))})"
+
+
 def last(values):
     if is_many(values):
         if not values:
@@ -330,3 +373,4 @@ def list_to_data(v):
 
 export("mo_dots.datas", list_to_data)
 export("mo_dots.datas", FlatList)
+export("mo_dots.datas", FrozenList)
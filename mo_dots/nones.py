@@ -8,12 +8,14 @@
 #
 from mo_imports import expect, export
 
+from mo_dots.fields import Path
 from mo_dots.utils import CLASS, KEY, SLOT, is_null, is_missing, is_sequence, register_null_type, is_many
 
 to_data, get_attr = expect("to_data", "get_attr")
 
 _get = object.__getattribute__
 _set = object.__setattr__
+_new = object.__new__
 _zero_list = []
 _null_hash = hash(None)
 
@@ -26,6 +28,10 @@ class NullType:
 
     Null INSTANCES WILL TRACK THEIR OWN DEREFERENCE PATH SO
     ASSIGNMENT CAN BE DONE
+
+    THE PATH IS KEPT FLAT: SLOT IS THE FIRST REAL (NON-Null) CONTAINER, AND
+    KEY IS THE TUPLE OF STEPS FROM THERE, SO a.b.c.d ON AN EMPTY Data IS
+    ONE CONTAINER AND A 4-TUPLE, NOT A CHAIN OF FOUR NullType
     """
 
     __slots__ = [SLOT, KEY]
@@ -35,8 +41,12 @@ class NullType:
         obj - VALUE BEING DEREFERENCED
         key - THE dict ITEM REFERENCE (DOT(.) IS NOT ESCAPED)
         """
-        _set(self, SLOT, obj)
-        _set(self, KEY, key)
+        if _get(obj, CLASS) is NullType and obj is not Null:
+            _set(self, SLOT, _get(obj, SLOT))
+            _set(self, KEY, _get(obj, KEY) + (key,))
+        else:
+            _set(self, SLOT, obj)
+            _set(self, KEY, (key,))
 
     def __bool__(self):
         return False
@@ -58,11 +68,11 @@ class NullType:
 
     def __iadd__(self, other):
         o = _get(self, SLOT)
-        if o is None:
+        path = _get(self, KEY)
+        if o is None and len(path) == 1:
             return self
-        key = _get(self, KEY)
 
-        _assign_to_null(o, [key], other)
+        _assign_to_null(o, path, other)
         return other
 
     def __sub__(self, other):
@@ -169,27 +179,36 @@ class NullType:
         return Null
 
     def __getitem__(self, key):
+        if self is Null:
+            # ASSIGNING THROUGH Null DOES NOTHING, SO NO NEED FOR A NEW NullType
+            return Null
         if isinstance(key, slice):
             return Null
         elif isinstance(key, int):
             return NullType(self, key)
-
-        path = _split_field(key)
-        output = self
-        for p in path:
-            output = NullType(output, p)
+        elif _get(key, CLASS) is Path:
+            path = tuple(key)
+        else:
+            path = tuple(_split_field(key))
+        output = _new(NullType)
+        _set(output, SLOT, _get(self, SLOT))
+        _set(output, KEY, _get(self, KEY) + path)
         return output
 
     def __getattr__(self, key):
+        if self is Null:
+            return Null
         key = str(key)
 
         o = to_data(_get(self, SLOT))
-        k = _get(self, KEY)
         if is_null(o):
             return NullType(self, key)
-        v = o.get(k)
-        if is_null(v):
-            return NullType(self, key)
+        # THE PATH MAY HAVE BEEN FILLED SINCE THIS Null WAS MADE
+        v = o
+        for k in _get(self, KEY):
+            v = v.get(k)
+            if is_null(v):
+                return NullType(self, key)
         try:
             return v.get(key)
         except Exception as e:
@@ -200,24 +219,20 @@ class NullType:
     def __setattr__(self, key, value):
         key = str(key)
         o = _get(self, SLOT)
-        k = _get(self, KEY)
-        seq = [k] + [key]
-        _assign_to_null(o, seq, value)
+        _assign_to_null(o, _get(self, KEY) + (key,), value)
 
     def __setitem__(self, key, value):
         o = _get(self, SLOT)
         if o is None:
             return
-        k = _get(self, KEY)
+        path = _get(self, KEY)
 
-        if o is None:
-            return
-        elif isinstance(key, int):
-            seq = [k] + [key]
-            _assign_to_null(o, seq, value)
+        if isinstance(key, int):
+            _assign_to_null(o, path + (key,), value)
+        elif _get(key, CLASS) is Path:
+            _assign_to_null(o, path + tuple(key), value)
         else:
-            seq = [k] + _split_field(key)
-            _assign_to_null(o, seq, value)
+            _assign_to_null(o, path + tuple(_split_field(key)), value)
 
     def keys(self):
         return set()
@@ -245,38 +260,61 @@ _set(Null, SLOT, Null)
 
 def _assign_to_null(obj, path, value, force=True):
     """
-    value IS ASSIGNED TO obj[self.path][key]
-    path IS AN ARRAY OF PROPERTY NAMES
+    value IS ASSIGNED TO obj[path]
+    path IS A SEQUENCE OF PROPERTY NAMES
     force=False IF YOU PREFER TO use setDefault()
+
+    ONE FORWARD PASS: WALK THE LEVELS THAT EXIST, AND AT THE FIRST MISSING
+    LEVEL OF A PLAIN dict, BUILD THE REST OF THE PATH AS NEW dicts
     """
-    try:
+    if obj is Null:
+        return
+    if _get(obj, CLASS) is NullType:
+        path = (*_get(obj, KEY), *path)
+        obj = _get(obj, SLOT)
         if obj is Null:
             return
-        if _get(obj, CLASS) is NullType:
-            o = _get(obj, SLOT)
-            p = _get(obj, KEY)
-            s = [p] + path
-            return _assign_to_null(o, s, value)
-
-        path0 = path[0]
-
-        if len(path) == 1:
-            if force:
-                obj[path0] = value
-            else:
-                _setdefault(obj, path0, value)
-            return
-
-        old_value = get_attr(obj, path0)
-        if is_null(old_value):
+    if "" in path[:-1]:
+        # EMPTY STEPS STAY AT THE CURRENT LEVEL
+        path = tuple(k for k in path[:-1] if k != "") + tuple(path[-1:])
+
+    last = len(path) - 1
+    for i in range(last):
+        step = path[i]
+        if _get(obj, CLASS) is dict and _get(step, CLASS) is str and "." not in step:
+            child = obj.get(step)
+            if is_null(child):
+                if is_null(value):
+                    return
+                rest = path[i + 1 :]
+                if all(_get(k, CLASS) is str and "." not in k for k in rest):
+                    for k in reversed(rest):
+                        value = {k: value}
+                    obj[step] = value
+                    return
+                obj[step] = child = {}
+            obj = child
+            continue
+
+        child = get_attr(obj, step)
+        if is_null(child):
             if is_null(value):
                 return
-            else:
-                obj[path0] = old_value = {}
+            obj[step] = {}
+            # READ IT BACK, obj MAY HOLD A COPY OR CONVERSION OF THE dict
+            child = get_attr(obj, Path((step,)))
+            if is_null(child):
+                # obj DOES NOT KEEP EMPTY dicts, SO ASSIGN THE REST OF THE PATH AS ONE VALUE
+                for k in reversed(path[i + 1 :]):
+                    value = {k: value}
+                obj[step] = value
+                return
+        obj = child
 
-        _assign_to_null(old_value, path[1:], value)
-    except Exception as e:
-        raise e
+    if force:
+        obj[path[last]] = value
+    else:
+        _setdefault(obj, path[last], value)
 
 
 def _split_field(field):
@@ -12,6 +12,7 @@ from copy import deepcopy
 from mo_future import generator_types, get_function_arguments, get_function_defaults, Mapping
 from mo_imports import export, expect
 
+from mo_dots import utils
 from mo_dots.datas import Data, _iadd, dict_to_data
 from mo_dots.lists import FlatList, list_to_data
 from mo_dots.nones import NullType, Null
@@ -24,6 +25,7 @@ from mo_dots.utils import (
     is_known_data_type,
     is_null,
     register_type,
+    TypeDispatch,
 )
 
 get_attr, set_attr, to_data, from_data, set_default = expect(
@@ -155,30 +157,43 @@ def get_keys(obj):
 
 
 def object_to_data(v):
-    try:
-        if is_null(v):
-            return Null
-    except Exception:
-        pass
-
-    if is_primitive(v):
+    wrap = _object_wrappers[_get(v, CLASS)]
+    if wrap is None:
         return v
+    return wrap(v)
 
-    _class = _get(v, CLASS)
-    if _class in (dict, OrderedDict):
-        m = _new(Data)
-        _set(m, SLOT, v)
-        return m
+
+def _classify_object(_class):
+    """
+    RETURN HOW object_to_data() WRAPS AN INSTANCE OF _class, None FOR NO WRAPPING
+    """
+    if _class in utils._null_types:
+        return _to_null
+    elif issubclass(_class, utils._primitive_types):
+        return None
+    elif _class in (dict, OrderedDict):
+        return dict_to_data
     elif _class in (tuple, list):
-        return list_to_data(v)
+        return list_to_data
     elif _class in (Data, DataObject, FlatList, NullType):
-        return v
+        return None
     elif _class in generator_types:
-        return (to_data(vv) for vv in v)
+        return _generator_to_data
     elif is_known_data_type(_class):
-        return DataObject(v)
+        return DataObject
     else:
-        return v
+        return None
+
+
+def _to_null(v):
+    return Null
+
+
+def _generator_to_data(v):
+    return (to_data(vv) for vv in v)
+
+
+_object_wrappers = TypeDispatch(_classify_object)
 
 
 class DataClass:
@@ -0,0 +1,686 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from collections import OrderedDict
+from copy import deepcopy
+from keyword import iskeyword
+
+from mo_imports import expect
+
+from mo_dots.datas import Data, leaves, hash_value
+from mo_dots.fields import Path, parse_field, literal_field, join_field, path_table
+from mo_dots.nones import Null, NullType
+from mo_dots.utils import CLASS, is_null, is_data, is_many, is_missing, register_data, get_logger
+
+to_data, from_data, _getdefault = expect("to_data", "from_data", "_getdefault")
+
+_get = object.__getattribute__
+_set = object.__setattr__
+_new = object.__new__
+_wrap_types = (dict, OrderedDict, list)  # SLOT VALUES STORED AS Data OR FlatList
+
+
+class Record:
+    """
+    LEAF VALUES KEYED BY PATH id, SEE PathTable
+    THE PATHS ARE HELD ONCE, IN A Shape SHARED BY ALL RECORDS WITH THE SAME
+    PATHS, SO EACH RECORD ONLY HOLDS ITS VALUES.  INNER OBJECTS ARE VIEWS
+    (RecordView) THAT READ AND WRITE THROUGH THE Record
+
+        r = Record({"run": {"machine": {"os": "linux"}}})
+        r.run.machine.os == "linux"
+        r.run.machine.os = "win"
+    """
+
+    __slots__ = ["_shape", "_values"]
+
+    def __init__(self, data=None, table=None):
+        table = table or path_table
+        if _get(data, CLASS) is Record and _get(data, "_shape").table is table:
+            _set(self, "_shape", _get(data, "_shape"))
+            _set(self, "_values", list(_get(data, "_values")))
+            return
+        lookup = {}
+        if data is not None:
+            for k, v in _leaves(data):
+                lookup[table.id(k)] = from_data(v)
+        shape = table.shape(lookup.keys())
+        _set(self, "_shape", shape)
+        _set(self, "_values", [lookup[i] for i in shape.ids])
+
+    @property
+    def shape(self):
+        """
+        THE INTERNED SET OF PATHS, EQUAL SETS ARE THE SAME OBJECT
+        """
+        return _get(self, "_shape")
+
+    def __getitem__(self, key):
+        if is_null(key):
+            return Null
+        if key == ".":
+            return self
+        return _get_path(self, _parse_key(key), key)
+
+    def __setitem__(self, key, value):
+        if key == ".":
+            get_logger().error("can not replace Record")
+        path = _parse_key(key)
+        value = from_data(value)
+        shape = _get(self, "_shape")
+        table = shape.table
+        values = _get(self, "_values")
+
+        # REMOVE THE OLD VALUE, ALONG WITH ANY LEAVES ABOVE OR BELOW IT
+        depth = len(path)
+        kept = []
+        for i, v in zip(shape.ids, values):
+            p = table.path(i)
+            if p[:depth] == path or path[: len(p)] == p:
+                continue
+            kept.append((i, v))
+
+        if is_data(value):
+            new = [(table.id(path + parse_field(k)), from_data(v)) for k, v in _leaves(value)]
+            # AN EMPTY dict IS KEPT AS A LEAF, SO THE PATH STILL EXISTS
+            kept.extend(new or [(table.id(path), {})])
+        elif not is_null(value):
+            kept.append((table.id(path), value))
+
+        shape = table.shape(i for i, _ in kept)
+        lookup = dict(kept)
+        _set(self, "_shape", shape)
+        _set(self, "_values", [lookup[i] for i in shape.ids])
+
+    def __getattr__(self, key):
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return Record.__getitem__(self, literal_field(key))
+
+    def __setattr__(self, key, value):
+        Record.__setitem__(self, literal_field(key), value)
+
+    def __delitem__(self, key):
+        Record.__setitem__(self, key, None)
+
+    def __delattr__(self, key):
+        Record.__setitem__(self, literal_field(key), None)
+
+    def get(self, key, default=Null):
+        v = self[key]
+        if _get(v, CLASS) is NullType:
+            if default is Null:
+                return v
+            return default
+        return v
+
+    def pop(self, key, default=Null):
+        v = self.get(key, default)
+        if _get(v, CLASS) is RecordView:
+            v = to_data(RecordView.to_dict(v))
+        Record.__setitem__(self, key, None)
+        return v
+
+    def __contains__(self, item):
+        value = Record.__getitem__(self, item)
+        if is_data(value) or value:
+            return True
+        return False
+
+    def keys(self):
+        return _keys(self, ())
+
+    def items(self):
+        return [(k, _get_path(self, (k,), Path((k,)))) for k in self.keys()]
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+    def leaves(self, prefix=None):
+        """
+        LIKE items() BUT RECURSIVE, AND ONLY FOR THE LEAVES (non dict) VALUES
+        """
+        shape = _get(self, "_shape")
+        table = shape.table
+        prefix = prefix or ""
+        for i, v in zip(shape.ids, _get(self, "_values")):
+            yield prefix + table.field(i), to_data(v)
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if _get(other, CLASS) is Record:
+            return _get(self, "_shape") is _get(other, "_shape") and _get(self, "_values") == _get(other, "_values")
+        return Data.__eq__(to_data(self.to_dict()), other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash_value(Record.to_dict(self))
+
+    def __copy__(self):
+        output = _new(Record)
+        _set(output, "_shape", _get(self, "_shape"))
+        _set(output, "_values", list(_get(self, "_values")))
+        return output
+
+    def __deepcopy__(self, memo):
+        output = _new(Record)
+        _set(output, "_shape", _get(self, "_shape"))
+        _set(output, "_values", deepcopy(_get(self, "_values"), memo))
+        return output
+
+    def to_dict(self):
+        """
+        RETURN THE RECORD AS NESTED dict
+        """
+        return _to_dict(self, ())
+
+    def __str__(self):
+        return str(self.to_dict())
+
+    def __repr__(self):
+        return f"Record({self.to_dict()!r})"
+
+
+class RecordView:
+    """
+    INNER OBJECT OF A Record, AT path; READS AND WRITES GO THROUGH THE Record
+    """
+
+    __slots__ = ["_record", "_path"]
+
+    def __init__(self, record, path):
+        _set(self, "_record", record)
+        _set(self, "_path", path)
+
+    def _full(self, key):
+        return tuple.__new__(Path, _get(self, "_path") + _parse_key(key))
+
+    def __getitem__(self, key):
+        if is_null(key):
+            return Null
+        if key == ".":
+            return self
+        path = RecordView._full(self, key)
+        return _get_path(_get(self, "_record"), path, path)
+
+    def __setitem__(self, key, value):
+        if key == ".":
+            Record.__setitem__(_get(self, "_record"), _get(self, "_path"), value)
+            return
+        Record.__setitem__(_get(self, "_record"), RecordView._full(self, key), value)
+
+    def __getattr__(self, key):
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return RecordView.__getitem__(self, literal_field(key))
+
+    def __setattr__(self, key, value):
+        RecordView.__setitem__(self, literal_field(key), value)
+
+    def __delitem__(self, key):
+        RecordView.__setitem__(self, key, None)
+
+    def __delattr__(self, key):
+        RecordView.__setitem__(self, literal_field(key), None)
+
+    def get(self, key, default=Null):
+        v = RecordView.__getitem__(self, key)
+        if _get(v, CLASS) is NullType:
+            if default is Null:
+                return v
+            return default
+        return v
+
+    def pop(self, key, default=Null):
+        v = RecordView.get(self, key, default)
+        if _get(v, CLASS) is RecordView:
+            v = to_data(RecordView.to_dict(v))
+        RecordView.__setitem__(self, key, None)
+        return v
+
+    def __contains__(self, item):
+        value = RecordView.__getitem__(self, item)
+        if is_data(value) or value:
+            return True
+        return False
+
+    def keys(self):
+        return _keys(_get(self, "_record"), _get(self, "_path"))
+
+    def items(self):
+        record = _get(self, "_record")
+        path = _get(self, "_path")
+        output = []
+        for k in RecordView.keys(self):
+            p = tuple.__new__(Path, path + (k,))
+            output.append((k, _get_path(record, p, p)))
+        return output
+
+    def values(self):
+        return [v for _, v in RecordView.items(self)]
+
+    def leaves(self, prefix=None):
+        """
+        LIKE items() BUT RECURSIVE, AND ONLY FOR THE LEAVES (non dict) VALUES
+        """
+        prefix = prefix or ""
+        for p, v in _under(_get(self, "_record"), _get(self, "_path")):
+            yield prefix + join_field(p), to_data(v)
+
+    def __iter__(self):
+        return iter(RecordView.items(self))
+
+    def __len__(self):
+        return len(RecordView.keys(self))
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if _get(other, CLASS) is RecordView:
+            other = RecordView.to_dict(other)
+        return Data.__eq__(to_data(RecordView.to_dict(self)), other)
+
+    def __ne__(self, other):
+        return not RecordView.__eq__(self, other)
+
+    def __hash__(self):
+        return hash_value(RecordView.to_dict(self))
+
+    def __copy__(self):
+        return RecordView(_get(self, "_record"), _get(self, "_path"))
+
+    def __deepcopy__(self, memo):
+        # A DETACHED COPY, SO CHANGES DO NOT REACH THE ORIGINAL Record
+        return Record(deepcopy(RecordView.to_dict(self), memo))
+
+    def to_dict(self):
+        """
+        RETURN THE INNER OBJECT AS NESTED dict (A COPY)
+        """
+        return _to_dict(_get(self, "_record"), _get(self, "_path"))
+
+    def __str__(self):
+        return str(RecordView.to_dict(self))
+
+    def __repr__(self):
+        return f"RecordView({RecordView.to_dict(self)!r})"
+
+
+def _parse_key(key):
+    """
+    RETURN key AS Path; A NON-str KEY IS ONE LITERAL STEP, AS IN Data
+    """
+    _class = _get(key, CLASS)
+    if _class is str or _class is Path:
+        return parse_field(key)
+    return tuple.__new__(Path, (str(key),))
+
+
+def _get_path(record, path, key):
+    """
+    RETURN THE VALUE AT path: A LEAF, A RecordView FOR AN INNER OBJECT, OR Null
+    """
+    shape = _get(record, "_shape")
+    table = shape.table
+    values = _get(record, "_values")
+    i = table.lookup(path)
+    if i is not None:
+        pos = shape.index.get(i)
+        if pos is not None:
+            v = values[pos]
+            if _get(v, CLASS) is dict:
+                # EMPTY dict
+                return RecordView(record, path)
+            return to_data(v)
+
+    depth = len(path)
+    for i in shape.ids:
+        p = table.path(i)
+        if len(p) > depth and p[:depth] == path:
+            return RecordView(record, path)
+
+    # A LEAF ABOVE path (LIKE A LIST OF dicts) IS WALKED THE SAME AS Data DOES
+    for depth in range(len(path) - 1, 0, -1):
+        i = table.lookup(path[:depth])
+        if i is not None:
+            pos = shape.index.get(i)
+            if pos is not None:
+                d = values[pos]
+                for n in path[depth:]:
+                    if _get(d, CLASS) is NullType:
+                        d = NullType(d, n)
+                    elif is_many(d):
+                        d = [_getdefault(dd, n) for dd in d]
+                    else:
+                        d = _getdefault(d, n)
+                return to_data(d)
+    return NullType(record, key)
+
+
+def _under(record, path):
+    """
+    (RELATIVE Path, VALUE) FOR EACH LEAF BELOW path
+    """
+    shape = _get(record, "_shape")
+    table = shape.table
+    depth = len(path)
+    for i, v in zip(shape.ids, _get(record, "_values")):
+        p = table.path(i)
+        if p[:depth] == path and (len(p) > depth or _get(v, CLASS) is dict):
+            yield p[depth:], v
+
+
+def _keys(record, path):
+    return set(p[0] for p, _ in _under(record, path) if p)
+
+
+def _to_dict(record, path):
+    output = {}
+    for p, v in _under(record, path):
+        if not p:
+            continue
+        d = output
+        for step in p[:-1]:
+            d = d.setdefault(step, {})
+        d[p[-1]] = {} if _get(v, CLASS) is dict else v
+    return output
+
+
+def _leaves(value):
+    """
+    LIKE leaves(), BUT EMPTY dicts ARE KEPT AS LEAVES
+    """
+    _class = _get(value, CLASS)
+    if _class is Record:
+        yield from Record.leaves(value)
+        return
+    elif _class is RecordView:
+        yield from RecordView.leaves(value)
+        return
+    value = from_data(value)
+    if _get(value, CLASS) is dict:
+        yield from _dict_leaves(value, "")
+    else:
+        yield from leaves(value)
+
+
+def _dict_leaves(d, prefix):
+    for k, v in d.items():
+        v = from_data(v)
+        field = prefix + literal_field(k)
+        if _get(v, CLASS) is dict:
+            if v:
+                yield from _dict_leaves(v, field + ".")
+            else:
+                yield field, v
+        elif not is_missing(v):
+            yield field, v
+
+
+register_data(Record)
+register_data(RecordView)
+
+
+def record_class(schema, name="record"):
+    """
+    RETURN A CLASS WITH ONE SLOT PER TOP-LEVEL FIELD, AND NESTED CLASSES FOR
+    INNER OBJECTS; SO PRESENT FIELDS ARE SLOT READS, MISSING FIELDS ARE Null
+
+        Run = record_class(["run.machine.os", "run.suite", "id"])
+        r = Run({"run": {"machine": {"os": "linux"}}, "id": 1})
+        r.run.machine.os == "linux"
+
+    :param schema: NESTED dict (INNER dicts ARE OBJECTS, OTHER VALUES ARE IGNORED), OR LIST OF DOT-DELIMITED FIELDS
+    :param name: NAME OF THE CLASS
+    """
+    return _make_record_class(_schema_tree(schema), name)
+
+
+def _schema_tree(schema):
+    """
+    RETURN NESTED dict FROM LITERAL KEY TO CHILD TREE, OR None FOR LEAVES
+    """
+    tree = {}
+    if is_data(schema):
+        for k, v in schema.items():
+            tree[k] = _schema_tree(v) if is_data(v) and v else None
+        return tree
+    for field in schema:
+        node = tree
+        path = parse_field(field)
+        for step in path[:-1]:
+            child = node.get(step)
+            if child is None:
+                child = node[step] = {}
+            node = child
+        node.setdefault(path[-1], None)
+    return tree
+
+
+def _make_record_class(tree, name):
+    fields = tuple(tree.keys())
+    slots = tuple(
+        f if f.isidentifier() and not iskeyword(f) and not f.startswith("_") and not hasattr(SlotRecord, f) else f"_{i}"
+        for i, f in enumerate(fields)
+    )
+    children = {
+        f: _make_record_class(child, f"{name}_{f}") for f, child in tree.items() if child
+    }
+    return type(
+        name,
+        (SlotRecord,),
+        {"__slots__": slots, "_fields": fields, "_slot_of": dict(zip(fields, slots)), "_children": children},
+    )
+
+
+class SlotRecord:
+    """
+    BASE OF THE CLASSES MADE BY record_class(), WITH THE Data INTERFACE
+    dict AND list VALUES ARE STORED WRAPPED, SO A SLOT READ RETURNS Data OR FlatList
+    """
+
+    __slots__ = []
+    _fields = ()  # LITERAL NAMES OF THE TOP-LEVEL FIELDS
+    _slot_of = {}  # MAP FROM FIELD TO SLOT NAME
+    _children = {}  # MAP FROM FIELD TO CLASS OF INNER OBJECT
+
+    def __init__(self, data=None, **kwargs):
+        if isinstance(data, SlotRecord):
+            data = SlotRecord.to_dict(data)
+        else:
+            data = from_data(data)
+        for values in (data, kwargs):
+            if not values:
+                continue
+            for k, v in values.items():
+                SlotRecord._set_field(self, k, v)
+
+    def _field(self, key):
+        """
+        RETURN STORED VALUE OF FIELD, OR None
+        """
+        slot = _get(self, "_slot_of").get(key)
+        if slot is None:
+            return None
+        try:
+            return _get(self, slot)
+        except AttributeError:
+            return None
+
+    def _set_field(self, key, value):
+        slot = _get(self, "_slot_of").get(key)
+        if slot is None:
+            get_logger().error("{key} is not in the schema", key=key)
+        value = from_data(value)
+        if is_null(value):
+            try:
+                object.__delattr__(self, slot)
+            except AttributeError:
+                pass
+            return
+        child = _get(self, "_children").get(key)
+        _class = _get(value, CLASS)
+        if child is not None:
+            if _class is not child:
+                value = child(value)
+        elif _class in _wrap_types:
+            value = to_data(value)
+        _set(self, slot, value)
+
+    def __getattr__(self, key):
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return NullType(self, key)
+
+    def __setattr__(self, key, value):
+        SlotRecord._set_field(self, key, value)
+
+    def __delattr__(self, key):
+        SlotRecord._set_field(self, key, None)
+
+    def __getitem__(self, key):
+        if is_null(key):
+            return Null
+        if key == ".":
+            return self
+        path = parse_field(key)
+        d = self
+        for i, step in enumerate(path):
+            if isinstance(d, SlotRecord):
+                d = SlotRecord._field(d, step)
+                if d is None:
+                    return NullType(self, key)
+            else:
+                return to_data(d)[Path(path[i:])]
+        return to_data(d)
+
+    def __setitem__(self, key, value):
+        path = parse_field(key)
+        if len(path) == 1:
+            SlotRecord._set_field(self, path[0], value)
+            return
+        first, rest = path[0], Path(path[1:])
+        child = SlotRecord._field(self, first)
+        if child is None:
+            if is_null(value):
+                return
+            SlotRecord._set_field(self, first, {})
+            child = SlotRecord._field(self, first)
+        if isinstance(child, SlotRecord):
+            child[rest] = value
+        else:
+            to_data(child)[rest] = value
+
+    def __delitem__(self, key):
+        SlotRecord.__setitem__(self, key, None)
+
+    def get(self, key, default=Null):
+        v = SlotRecord.__getitem__(self, key)
+        if _get(v, CLASS) is NullType:
+            if default is Null:
+                return v
+            return default
+        return v
+
+    def pop(self, key, default=Null):
+        v = SlotRecord.get(self, key, default)
+        SlotRecord.__setitem__(self, key, None)
+        return v
+
+    def __contains__(self, item):
+        value = SlotRecord.__getitem__(self, item)
+        if is_data(value) or value:
+            return True
+        return False
+
+    def keys(self):
+        return set(f for f in _get(self, "_fields") if SlotRecord._field(self, f) is not None)
+
+    def items(self):
+        for f in _get(self, "_fields"):
+            v = SlotRecord._field(self, f)
+            if v is not None:
+                yield f, to_data(v)
+
+    def values(self):
+        return [v for _, v in SlotRecord.items(self)]
+
+    def leaves(self, prefix=None):
+        """
+        LIKE items() BUT RECURSIVE, AND ONLY FOR THE LEAVES (non dict) VALUES
+        """
+        prefix = prefix or ""
+        for f in _get(self, "_fields"):
+            v = SlotRecord._field(self, f)
+            if v is None:
+                continue
+            field = prefix + literal_field(f)
+            if isinstance(v, SlotRecord):
+                yield from SlotRecord.leaves(v, field + ".")
+            elif is_data(v) and not is_many(v):
+                yield from leaves(v, field + ".")
+            else:
+                yield field, to_data(v)
+
+    def to_dict(self):
+        """
+        RETURN THE RECORD AS NESTED dict
+        """
+        output = {}
+        for f in _get(self, "_fields"):
+            v = SlotRecord._field(self, f)
+            if v is None:
+                continue
+            output[f] = v.to_dict() if isinstance(v, SlotRecord) else from_data(v)
+        return output
+
+    def __iter__(self):
+        return SlotRecord.items(self)
+
+    def __len__(self):
+        return len(SlotRecord.keys(self))
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, SlotRecord):
+            other = other.to_dict()
+        return to_data(SlotRecord.to_dict(self)) == other
+
+    def __ne__(self, other):
+        return not SlotRecord.__eq__(self, other)
+
+    def __hash__(self):
+        return hash_value(SlotRecord.to_dict(self))
+
+    def __str__(self):
+        return str(SlotRecord.to_dict(self))
+
+    def __repr__(self):
+        return f"{_get(self, CLASS).__name__}({SlotRecord.to_dict(self)!r})"
+
+
+register_data(SlotRecord, subclasses=True)
@@ -12,6 +12,7 @@ from collections import OrderedDict
 from dataclasses import is_dataclass
 from datetime import datetime, date, timedelta, time
 from decimal import Decimal
+from weakref import ref
 
 from mo_future import none_type, generator_types
 
@@ -32,12 +33,46 @@ def get_module(name):
         )
 
 
+class TypeDispatch(dict):
+    """
+    MAP FROM EXACT TYPE TO HANDLER, SO EACH LOOKUP IS ONE HASH PROBE
+    A MISS CALLS classify(type), AND CACHES THE ANSWER
+    ALL TABLES ARE CLEARED WHEN A register_*() FUNCTION CHANGES THE TYPE CATEGORIES
+    A FULL TABLE IS CLEARED TOO, SO GENERATED CLASSES (record_class) ARE NOT HELD FOREVER
+    """
+
+    __slots__ = ["classify", "__weakref__"]
+
+    def __init__(self, classify):
+        dict.__init__(self)
+        self.classify = classify
+        _dispatchers.append(ref(self, _dispatchers.remove))
+
+    def __missing__(self, type_):
+        if len(self) >= MAX_DISPATCH_SIZE:
+            self.clear()
+        output = self[type_] = self.classify(type_)
+        return output
+
+
+MAX_DISPATCH_SIZE = 1000  # TYPES CACHED PER TABLE
+_dispatchers = []  # WEAK REFERENCES, SO UNUSED TABLES ARE FREED
+
+
+def _clear_dispatch():
+    for r in list(_dispatchers):
+        d = r()
+        if d is not None:
+            d.clear()
+
+
 _null_types = (none_type,)
 
 
 def register_null_type(_type):
     global _null_types
     _null_types = tuple(set(_null_types + (_type,)))
+    _clear_dispatch()
 
 
 def is_null(value):
@@ -89,18 +124,31 @@ def is_primitive(value):
 def register_primitive(_type):
     global _primitive_types
     _primitive_types = tuple(set(_primitive_types + (_type,)))
+    _clear_dispatch()
 
 
 _data_types = data_types = (dict, OrderedDict)  # TYPES TO HOLD DATA
+_data_bases = tuple()  # TYPES WHOSE SUBCLASSES ALSO HOLD DATA
 
 
-def register_data(type_):
+def register_data(type_, subclasses=False):
     """
     :param type_:  ADD OTHER TYPE THAT HOLDS DATA
+    :param subclasses: True IF ALL SUBCLASSES OF type_ ALSO HOLD DATA
     :return:
     """
-    global _data_types
+    global _data_types, _data_bases
     _data_types = tuple(set(_data_types + (type_,)))
+    if subclasses:
+        _data_bases = tuple(set(_data_bases + (type_,)))
+    _clear_dispatch()
+
+
+def _classify_data_subclass(type_):
+    return bool(_data_bases) and issubclass(type_, _data_bases)
+
+
+_data_subclasses = TypeDispatch(_classify_data_subclass)
 
 
 def is_data(d):
@@ -108,7 +156,8 @@ def is_data(d):
     :param d:
     :return: True IF d IS A TYPE THAT HOLDS DATA
     """
-    return _get(d, CLASS) in _data_types
+    _class = _get(d, CLASS)
+    return _class in _data_types or _data_subclasses[_class]
 
 
 _known_data_types = tuple()
@@ -117,6 +166,7 @@ _known_data_types = tuple()
 def register_type(*_classes):
     global _known_data_types
     _known_data_types = tuple(set(_known_data_types + _classes))
+    _clear_dispatch()
 
 
 def is_namedtuple(obj):
@@ -146,6 +196,7 @@ def register_list(_type):
     finite_types = tuple(set(finite_types + (_type,)))
     sequence_types = tuple(set(sequence_types + (_type,)))
     _many_types = tuple(set(_many_types + (_type,)))
+    _clear_dispatch()
 
 
 # ITERATORS THAT ARE CONSIDERED PRIMITIVE
@@ -193,6 +244,7 @@ def is_many(value):
 def register_many(_type):
     global _many_types
     _many_types = _many_types + (_type,)
+    _clear_dispatch()
 
 
 def cache(func):
@@ -0,0 +1,52 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+"""
+ORIGINAL REGEX-BASED FIELD FUNCTIONS, KEPT AS A REFERENCE FOR THE
+UNIT TESTS AND THE BENCHMARKS
+"""
+from mo_logs import Log
+
+from mo_dots import fields
+
+
+def split_field_using_regex(field):
+    """
+    ORIGINAL split_field, BEFORE THE SCANNER
+    """
+    if fields.ILLEGAL_DOTS.search(field):
+        Log.error("Odd number of dots is not allowed")
+    if field.startswith(".."):
+        remainder = field.lstrip(".")
+        back = len(field) - len(remainder) - 1
+        return [".."] * back + [fields.UNESCAPE_DOTS.sub(".", k) for k in fields.SPLIT_DOTS.split(remainder) if k]
+    else:
+        return [fields.UNESCAPE_DOTS.sub(".", k) for k in fields.SPLIT_DOTS.split(field) if k]
+
+
+def join_field_using_regex(path):
+    """
+    ORIGINAL join_field, BEFORE THE SCANNER
+    """
+    if not path:
+        return "."
+    prefix = ""
+    while True:
+        try:
+            i = path.index("..")
+            if i == 0:
+                prefix += "."
+                path = path[1:]
+            else:
+                path = path[: i - 1] + path[i + 1 :]
+        except ValueError:
+            return ("." if prefix else "") + prefix + ".".join(literal_field_using_regex(f) for f in path)
+
+
+def literal_field_using_regex(field):
+    return fields.ESCAPE_DOTS2.sub("..", fields.ESCAPE_DOTS1.sub("\b", field))
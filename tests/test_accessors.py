@@ -0,0 +1,195 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from collections import namedtuple
+from copy import deepcopy
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_dots import *
+
+Point = namedtuple("Point", ["x", "y"])
+
+SAMPLES = [
+    {},
+    {"a": None},
+    {"a": 1},
+    {"a": {"b": {"c": 42}}},
+    {"a": {"b": None}},
+    {"a": {"b": {"c": [1, 2]}}},
+    {"a": [{"b": {"c": 1}}, {"b": {"c": 2}}, {"b": None}]},
+    {"a": {1: {"c": "one"}}},
+    {"a": {"b": Point(3, 4)}},
+    {"a": {"b.c": 7}},
+    {"a": "text"},
+]
+
+PATHS = ["a", "a.b", "a.b.c", "a.1.c", "a.b.x", "a.b..c", "x.y.z", ".", Path("a.b.c")]
+
+
+class TestAccessors(FuzzyTestCase):
+    def test_getter_matches_getitem(self):
+        for path in PATHS:
+            getter = compile_getter(path)
+            for sample in SAMPLES:
+                data = to_data(sample)
+                expected = data[path]
+                result = getter(data)
+                self.assertEqual(_get_class(result), _get_class(expected), msg=f"{path} on {sample}")
+                self.assertEqual(from_data(result), from_data(expected), msg=f"{path} on {sample}")
+                self.assertEqual(from_data(getter(sample)), from_data(expected), msg=f"{path} on raw {sample}")
+
+    def test_getter_miss_is_assignable(self):
+        data = Data()
+        getter = compile_getter("a.b.c")
+        getter(data)["d"] = 1
+        self.assertEqual(data, {"a": {"b": {"c": {"d": 1}}}})
+
+    def test_getter_fans_out(self):
+        getter = compile_getter("a.b")
+        result = getter({"a": [{"b": 1}, {"b": 2}]})
+        self.assertIsInstance(result, FlatList)
+        self.assertEqual(result, [1, 2])
+
+    def test_null_path(self):
+        self.assertIs(compile_getter(None)(Data(a=1)), Null)
+
+    def test_setter_matches_setitem(self):
+        paths = ["a", "a.b", "a.b.c", "a.1.c", "a.b.x", "a.b..c", "x.y.z", Path("a.b.c")]
+        samples = [
+            {},
+            {"a": 1},
+            {"a": {"b": {"c": 42}}},
+            {"a": {"b": {"c": [1, 2]}}},
+            {"a": [{"b": {"c": 1}}, {"b": {"c": 2}}]},
+            {"a": {1: {"c": "one"}}},
+            {"a": {"b.c": 7}},
+        ]
+        for path in paths:
+            setter = compile_setter(path)
+            for sample in samples:
+                for value in [3, {"d": 4}, None, Null, to_data({"e": 5})]:
+                    expected = to_data(deepcopy(sample))
+                    try:
+                        expected[path] = value
+                    except Exception:
+                        with self.assertRaises(Exception):
+                            setter(deepcopy(sample), value)
+                        continue
+                    result = to_data(deepcopy(sample))
+                    setter(result, value)
+                    self.assertTrue(from_data(result) == from_data(expected), msg=f"{path}={value} on {sample}")
+                    raw = deepcopy(sample)
+                    setter(raw, value)
+                    self.assertTrue(raw == from_data(expected), msg=f"{path}={value} on raw {sample}")
+
+    def test_projector_matches_getitem(self):
+        paths = PATHS + ["a.b", "a.b.d", None, "a"]
+        project = projector(paths)
+        for sample in SAMPLES:
+            data = to_data(sample)
+            expected = tuple(data[p] for p in paths)
+            for record in [data, sample]:
+                result = project(record)
+                self.assertEqual(len(result), len(paths))
+                for p, r, e in zip(paths, result, expected):
+                    self.assertEqual(_get_class(r), _get_class(e), msg=f"{p} on {sample}")
+                    self.assertTrue(from_data(r) == from_data(e), msg=f"{p} on {sample}")
+
+    def test_projector_as_data(self):
+        project = projector(["run.machine.os", "run.machine.platform", "run.suite", "missing.value"], as_data=True)
+        result = project({"run": {"machine": {"os": "linux", "platform": "x64"}, "suite": "mochitest"}})
+        self.assertIsInstance(result, Data)
+        self.assertTrue(
+            from_data(result) == {"run": {"machine": {"os": "linux", "platform": "x64"}, "suite": "mochitest"}}
+        )
+
+    def test_setter_makes_path(self):
+        setter = compile_setter("a.b.c.d")
+        data = {}
+        setter(data, 1)
+        self.assertEqual(data, {"a": {"b": {"c": {"d": 1}}}})
+        setter(data, None)
+        self.assertEqual(data, {"a": {"b": {"c": {}}}})
+
+    def test_setter_broadcasts(self):
+        data = to_data({"a": [{"b": {}}, {"b": {}}]})
+        compile_setter("a.b.c")(data, 1)
+        self.assertEqual(data, {"a": [{"b": {"c": 1}}, {"b": {"c": 1}}]})
+
+    def test_adder_matches_iadd(self):
+        paths = ["a", "a.b", "a.b.c", "a.1.c", "a.b..c", "x.y.z", Path("a.b.c")]
+        samples = [
+            {},
+            {"a": 1},
+            {"a": {"b": {"c": 42}}},
+            {"a": {"b": {"c": [1, 2]}}},
+            {"a": {"b": {"c": "s"}}},
+            {"a": {"b": {"c": {"d": 1}}}},
+            {"a": {"b.c": 7}},
+        ]
+        for path in paths:
+            adder = compile_adder(path)
+            for sample in samples:
+                for amount in [3, 0.5, [4], None, "t", {"d": 4}]:
+                    expected = to_data(deepcopy(sample))
+                    try:
+                        expected[path] += deepcopy(amount)
+                    except Exception:
+                        with self.assertRaises(Exception):
+                            adder(deepcopy(sample), deepcopy(amount))
+                        continue
+                    result = to_data(deepcopy(sample))
+                    adder(result, deepcopy(amount))
+                    self.assertTrue(from_data(result) == from_data(expected), msg=f"{path}+={amount} on {sample}")
+                    raw = deepcopy(sample)
+                    adder(raw, deepcopy(amount))
+                    self.assertTrue(raw == from_data(expected), msg=f"{path}+={amount} on raw {sample}")
+
+    def test_accumulator(self):
+        acc = DataAccumulator()
+        for os in ["linux", "win", "linux"]:
+            acc.add(Path(("os", os)))
+            acc.add("total", 2)
+            acc.add("seen", [os])
+        self.assertEqual(acc.data, {"os": {"linux": 2, "win": 1}, "total": 6, "seen": ["linux", "win", "linux"]})
+
+        existing = {"os": {"mac": 1}}
+        DataAccumulator(existing).add("os.mac").add("os.win", 4)
+        self.assertEqual(existing, {"os": {"mac": 2, "win": 4}})
+
+    def test_select_paths_matches_leaves(self):
+        tree = {
+            "run": {"machine": {"os": "linux", "name": "m1"}, "duration": 3},
+            "result": {"test": {"duration": 4, "status": "PASS"}, "duration": 5},
+            "a.b": {"duration": 6},
+            "list": [{"duration": 7}],
+            "duration": 8,
+        }
+        leaves = list(to_data(tree).leaves())
+        for pattern, expected in [
+            ("**.duration", [(p, v) for p, v in leaves if split_field(p)[-1] == "duration"]),
+            ("*.duration", [(p, v) for p, v in leaves if len(split_field(p)) == 2 and p.endswith("duration")]),
+            ("run.**", [(p, v) for p, v in leaves if p.startswith("run.")]),
+            ("**.*s", [(p, v) for p, v in leaves if split_field(p)[-1].endswith("s")]),
+            ("a..b.duration", [("a..b.duration", 6)]),
+        ]:
+            result = [(p, v) for p, v in select_paths(tree, pattern) if not is_data(v)]
+            self.assertTrue(sorted(result) == sorted(expected), msg=pattern)
+
+    def test_select_paths_includes_inner_nodes(self):
+        tree = to_data({"a": {"b": {"c": 1}}, "x": {"b": 2}})
+        self.assertTrue(
+            list(select_paths(tree, "*.b")) == [("a.b", {"c": 1}), ("x.b", 2)]
+        )
+        self.assertTrue(list(select_paths(tree, "**.b", with_paths=False)) == [{"c": 1}, 2])
+        self.assertTrue(list(select_paths(tree, "nothing.*")) == [])
+
+
+def _get_class(value):
+    return object.__getattribute__(value, "__class__")
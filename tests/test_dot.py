@@ -20,7 +20,9 @@ from math import isnan
 from mo_times import Date
 
 from mo_dots import *
+from mo_dots import _getdefault
 from mo_dots.datas import _leaves
+from mo_dots.utils import KEY, SLOT
 from tests import ambiguous_test
 
 
@@ -353,6 +355,82 @@ class TestDot(FuzzyTestCase):
         A[None] = "test"
         self.assertEqual(a, {})
 
+    def test_null_path_is_flat(self):
+        a = {"x": 1}
+        n = to_data(a).b.c.d
+        self.assertIs(object.__getattribute__(n, SLOT), a)
+        self.assertEqual(object.__getattribute__(n, KEY), ("b", "c", "d"))
+
+    def test_deep_assign_creates_missing(self):
+        a = {"b": {"x": 1}}
+        A = to_data(a)
+        A.b.c.d.e = 1
+        A.f.g["h..i"].j = 2
+        A.k.l = None
+        self.assertEqual(a, {"b": {"x": 1, "c": {"d": {"e": 1}}}, "f": {"g": {"h.i": {"j": 2}}}})
+
+    def test_assign_when_container_drops_empty_dicts(self):
+        class Sparse(dict):
+            def __setitem__(self, key, value):
+                if value != {}:
+                    dict.__setitem__(self, key, value)
+
+        s = Sparse()
+        NullType(s, "x").y.z = 1
+        self.assertEqual(s, {"x": {"y": {"z": 1}}})
+
+    def test_assign_with_empty_steps(self):
+        d = to_data({})
+        d[".a"] = 5
+        self.assertTrue(from_data(d) == {"a": 5})
+
+        d = to_data({"a": {}})
+        d.a[".b"] = 1
+        self.assertTrue(from_data(d) == {"a": {"b": 1}})
+
+        d = to_data({})
+        d.x[".b"] = 1
+        d[Path(("y", "", "z"))] = 2
+        self.assertTrue(from_data(d) == {"x": {"b": 1}, "y": {"z": 2}})
+
+    def test_iadd_through_none_raises(self):
+        d = to_data({"a": None})
+        with self.assertRaises(Exception):
+            d["a.b.c"] += 1
+
+    def test_getdefault_by_type(self):
+        class Thing:
+            def __init__(self):
+                self.a = 1
+
+        getdefault = _getdefault
+        self.assertEqual(getdefault({"a": 1}, "a"), 1)
+        self.assertIsInstance(getdefault({"a": 1}, "x"), NullType)
+        self.assertEqual(getdefault(Thing(), "a"), 1)
+        self.assertIsInstance(getdefault(Thing(), "x"), NullType)
+        self.assertEqual(getdefault({1: "one"}, "1"), "one")
+        self.assertIsInstance(getdefault({1: "one"}, "a"), NullType)
+        result = getdefault([{"a": 1}, {"b": 2}], "a")
+        self.assertEqual(result[0], 1)
+        self.assertIsInstance(result[1], NullType)
+
+    def test_contains_matches_getitem(self):
+        sample = to_data({
+            "a": {"b": {"c": 1, "z": 0, "e": "", "l": [], "n": None, "d": {}}, "1": {"x": 2}},
+            "list": [{"x": 1}, {"x": 0}],
+            "a.b": "literal",
+            "none": None,
+            "t": (),
+        })
+        keys = [
+            "a", "a.b", "a.b.c", "a.b.z", "a.b.e", "a.b.l", "a.b.n", "a.b.d", "a.b.n.x", "a.1.x",
+            "a.x.y", "list", "list.x", "a..b", "none", "t", "missing", "missing.deeper", ".", 1, Path("a.b.c"),
+        ]
+        for key in keys:
+            value = Data.__getitem__(sample, key)
+            expected = bool(is_data(value) or value)
+            self.assertEqual(key in sample, expected, msg=f"{key}")
+
     def test_increment(self):
         a = {}
         b = to_data(a)
@@ -642,6 +720,15 @@ class TestDot(FuzzyTestCase):
         self.assertAlmostEqual(d.pop("b"), 2)
         self.assertAlmostEqual({}, d)
 
+    def test_pop_root_path(self):
+        d = to_data({"a": 1})
+        try:
+            d.pop(Path(()))
+            self.fail("expected error")
+        except Exception as e:
+            self.assertNotIsInstance(e, TypeError)
+            self.assertIn("root path", str(e))
+
     def test_values(self):
         a = to_data({"a": 1, "b": 2})
         result = []
@@ -767,7 +854,33 @@ class TestDot(FuzzyTestCase):
 
     def test_items(self):
         a = to_data({"a.b": "c"})
-        self.assertEqual(a.items(), [("a.b", "c")])
+        self.assertEqual(list(a.items()), [("a.b", "c")])
+
+    def test_views_are_live_and_lazy(self):
+        raw = {"a": {"b": 1}, "c": None, "d": [1, 2]}
+        a = to_data(raw)
+        keys, items, values = a.keys(), a.items(), a.values()
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(len(items), 2)
+        self.assertEqual(len(items), len(list(items)))
+        self.assertIn("a", keys)
+        self.assertIn(("a", {"b": 1}), items)
+        self.assertIn(("d", [1, 2]), items)
+        self.assertNotIn(("c", None), items)
+        self.assertIn(to_data([1, 2]), values)
+        self.assertEqual([k for k, _ in items], ["a", "d"])
+        self.assertIsInstance(next(iter(items))[1], Data)
+
+        a.e = 3
+        self.assertIn("e", keys)
+        self.assertIn(("e", 3), items)
+        self.assertIn(3, values)
+        self.assertEqual(len(values), 4)
+
+        b = to_data({"a": 1, "b": None})
+        self.assertEqual(len(b.items()), 1)
+        self.assertTrue(b.items() == {("a", 1)})
+        self.assertTrue(b.items() <= {("a", 1), ("z", 2)})
 
     def test_iteritems(self):
         a = to_data({"a.b": "c"})
@@ -1196,6 +1309,147 @@ class TestDot(FuzzyTestCase):
         data = to_data({"a": OrderedDict(b=2)})
         self.assertEqual(data.a.b, 2)
 
+    def test_lookup_by_container_type(self):
+        thing = SampleData()
+        raw = {"a": {1: "one", "b": [{"c": 1}, {"c": 2}]}, "t": (5, 6), "o": thing}
+        data = to_data(raw)
+        self.assertEqual(data["a.1"], "one")
+        self.assertEqual(data["a.b.c"], [1, 2])
+        self.assertEqual(data["a.x.y"], None)
+        self.assertEqual(data["o.a"], thing.a)
+        self.assertEqual(data["o.nothing"], None)
+        self.assertEqual(get_attr(raw, "t.1"), 6)
+        self.assertEqual(get_attr(raw, "a.b.0.c"), 1)
+        self.assertEqual(get_attr(raw, "a.b.9"), None)
+        self.assertEqual(get_attr(raw, "o.nothing"), None)
+        self.assertEqual(get_attr(raw, "a.keys")(), raw["a"].keys())
+
+    def test_cursor_reuses_wrapper(self):
+        rows = [{"run": {"machine": {"os": "linux"}, "suite": "a"}}, {"run": {"suite": "b"}}]
+        cursor = DataCursor()
+        self.assertEqual([cursor(r).run.machine.os for r in rows], ["linux", None])
+        self.assertIs(cursor(rows[0]).run.machine, cursor)
+        self.assertIs(cursor(rows[0])["run.machine"], cursor)
+        self.assertEqual(cursor(to_data(rows[1]))["run.suite"], "b")
+        self.assertIs(from_data(cursor(rows[0]).run), rows[0]["run"])
+
+        cursor(rows[1]).run.machine.os = "win"
+        self.assertEqual(rows[1], {"run": {"machine": {"os": "win"}, "suite": "b"}})
+
+    def test_frozen_data_is_hashable(self):
+        raw = {"a": {"b": [1, {"c": 2}]}, "n": None, "s": {1, 2}}
+        a = freeze(raw)
+        b = freeze(to_data({"s": {2, 1}, "a": {"b": [1, {"c": 2}]}}))
+        self.assertIsInstance(a, FrozenData)
+        self.assertIsInstance(a.a.b, FrozenList)
+        self.assertTrue(a == b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual({a: "found"}[b], "found")
+        self.assertEqual(len({freeze({"x": [1]}), freeze({"x": [1], "y": None}), freeze({"x": [2]})}), 2)
+        self.assertTrue(a == to_data(raw))
+        self.assertTrue(to_data(raw) == a)
+        self.assertEqual(a["a.b.c"], to_data(raw)["a.b.c"])
+        self.assertIs(a.x, Null)
+        self.assertIs(freeze(a), a)
+        self.assertIs(freeze({"k": a.a}).k, a.a)
+
+    def test_frozen_data_can_not_change(self):
+        a = freeze({"a": {"b": [1]}})
+        with self.assertRaises(Exception):
+            a.a.b.append(2)
+        with self.assertRaises(Exception):
+            a.a.c = 2
+        self.assertTrue(a == {"a": {"b": [1]}})
+
+    def test_frozen_data_in_set_can_not_change(self):
+        f = freeze({"x": 1})
+        s = {f}
+        h = hash(f)
+        with self.assertRaises(Exception):
+            f |= to_data({"y": 2})
+        with self.assertRaises(Exception):
+            f += {"y": 2}
+        with self.assertRaises(Exception):
+            f.clear()
+        with self.assertRaises(Exception):
+            f.pop("x")
+        self.assertEqual(hash(f), h)
+        self.assertIn(f, s)
+        self.assertIn(freeze({"x": 1}), s)
+        self.assertTrue(f == {"x": 1})
+
+    def test_thaw(self):
+        a = freeze({"a": {"b": [1, {"c": 2}]}, "s": {3}})
+        t = thaw(a)
+        self.assertIsInstance(t, Data)
+        self.assertIsInstance(from_data(t.a.b), list)
+        t.a.b.append(4)
+        t.a.d = 5
+        self.assertTrue(from_data(t) == {"a": {"b": [1, {"c": 2}, 4], "d": 5}, "s": {3}})
+        self.assertTrue(a == {"a": {"b": [1, {"c": 2}]}, "s": {3}})
+
+    def test_eq_null_is_missing(self):
+        self.assertTrue(to_data({"a": 1, "b": None}) == {"a": 1})
+        self.assertTrue(to_data({"a": 1}) == to_data({"a": 1, "b": None}))
+        self.assertTrue(to_data({"a": {"b": None, "c": [{"d": None}]}}) == to_data({"a": {"c": [{}]}}))
+        self.assertTrue(to_data({"a": [1, 2]}) == {"a": to_data([1, 2])})
+        self.assertTrue(to_data({"a.b": 1}) == to_data({"a.b": 1}))
+        self.assertFalse(Data(a=1) == Data())
+        self.assertFalse(Data() == Data(a=1))
+        self.assertFalse(to_data({"a": {"b": 1}}) == {"a": {"b": 2}})
+        self.assertFalse(to_data({"a": [1, 2]}) == {"a": [2, 1]})
+        self.assertFalse(to_data({"a": 1}) == {"a": 1, "b": 2})
+        self.assertFalse(to_data({"a": None}) == {"a": 0})
+
+        # EMPTY VALUES ARE Null, SO THE SAME AS MISSING
+        self.assertTrue(to_data({"x": []}) == to_data({}))
+        self.assertTrue(to_data({"a": {}}) == to_data({}))
+        self.assertTrue(to_data({"e": ""}) == to_data({}))
+        self.assertTrue(to_data({}) == to_data({"a": {}, "e": "", "x": []}))
+        self.assertTrue(to_data({"a": []}) == to_data({"a": None}))
+        self.assertTrue(to_data({"a": {"b": None}}) == {"a": {"c": ""}})
+        self.assertFalse(to_data({"a": [1]}) == {"a": []})
+        self.assertFalse(to_data({"a": {"b": 1}}) == {"a": {}})
+
+    def test_read_only_miss_is_shared_null(self):
+        raw = {"a": {"b": {"c": 1}, "l": [{"d": 2}], "n": None}, "o": OrderedDict(b=3)}
+        data = read_only(raw)
+        self.assertIs(data.x, Null)
+        self.assertIs(data["x"], Null)
+        self.assertIs(data["a.b.x"], Null)
+        self.assertIs(data.a.x.y.z, Null)
+        self.assertIs(data.a.n, Null)
+        self.assertEqual(data.get("x", 42), 42)
+        self.assertEqual(data.a.b.c, 1)
+        self.assertEqual(data["a.b.c"], 1)
+        self.assertEqual(data["a.l.d"], [2])
+        self.assertEqual(data.o.b, 3)
+        self.assertIsInstance(data.a.b, ReadOnlyData)
+        self.assertIs(from_data(data), raw)
+        self.assertTrue(data == raw)
+
+    def test_read_only_can_not_change(self):
+        data = read_only(to_data({"a": {"b": 1}}))
+        with self.assertRaises(Exception):
+            data.a.b = 2
+        with self.assertRaises(Exception):
+            data["a.b"] = 2
+        with self.assertRaises(Exception):
+            del data.a
+        self.assertEqual(data.a.b, 1)
+
+        raw = {"a": {"b": 1}}
+        data = read_only(raw)
+        with self.assertRaises(Exception):
+            data += {"c": 1}
+        with self.assertRaises(Exception):
+            data |= to_data({"c": 1, "a": {"d": 2}})
+        with self.assertRaises(Exception):
+            data.clear()
+        self.assertTrue(from_data(data + {"c": 1}) == {"a": {"b": 1}, "c": 1})
+        self.assertTrue(from_data(data | to_data({"c": 1})) == {"a": {"b": 1}, "c": 1})
+        self.assertEqual(raw, {"a": {"b": 1}})
+
 
 class _TestMapping(object):
     def __init__(self):
@@ -9,17 +9,21 @@
 
 import os
 import sys
+import tracemalloc
 from collections import deque
+from copy import deepcopy
 from unittest import skipIf
 
-from mo_dots import datas
-from mo_future import text, Mapping
+import mo_dots
+from mo_dots import datas, fields
+from mo_future import text, Mapping, first
 from mo_logs import Log
 from mo_math import randoms
 from mo_testing.fuzzytestcase import FuzzyTestCase
 from mo_times import Timer
 
 from mo_dots import *
+from tests.reference_fields import split_field_using_regex, join_field_using_regex, literal_field_using_regex
 
 IS_CI = bool(os.environ.get("TRAVIS") or os.environ.get("CI"))
 IS_COVERAGE = bool(os.environ.get("COVERAGE"))
@@ -130,6 +134,518 @@ class TestDotSpeed(FuzzyTestCase):
         self.assertEqual(d_result, s_result)
         self.assertEqual(i_result, s_result)
 
+    def test_plain_field_fast_path(self):
+        schema = realistic_schema()
+        paths = [split_field(f) for f in schema]
+        num = 20
+
+        with Timer("split using regex") as regex_split:
+            for _ in range(num):
+                r_result = [split_field_using_regex(f) for f in schema]
+
+        with Timer("split using scanner") as fast_split:
+            for _ in range(num):
+                s_result = [list(fields._split(f)) for f in schema]
+
+        with Timer("join using regex") as regex_join:
+            for _ in range(num):
+                rj_result = [join_field_using_regex(p) for p in paths]
+
+        with Timer("join using scanner") as fast_join:
+            for _ in range(num):
+                sj_result = [join_field(p) for p in paths]
+
+        self.assertEqual(s_result, r_result)
+        self.assertEqual(sj_result, rj_result)
+        Log.info(
+            "split is {{s|round(places=2)}}x faster, join is {{j|round(places=2)}}x faster",
+            s=regex_split.duration.seconds / fast_split.duration.seconds,
+            j=regex_join.duration.seconds / fast_join.duration.seconds,
+        )
+
+    def test_bulk_fields(self):
+        schema = realistic_schema()
+        set_field_cache_size(100)  # SCHEMA DOES NOT FIT IN CACHE
+
+        try:
+            with Timer("one column at a time") as single:
+                s_split = [split_field(f) for f in schema]
+                s_concat = [concat_field("parent.nested", f) for f in schema]
+                s_join = [join_field(p) for p in s_split]
+
+            with Timer("all columns together") as bulk:
+                b_split = split_fields(schema)
+                b_concat = concat_fields("parent.nested", schema)
+                b_join = join_fields(b_split)
+        finally:
+            set_field_cache_size()
+
+        self.assertEqual(b_split, s_split)
+        self.assertEqual(b_concat, s_concat)
+        self.assertEqual(b_join, s_join)
+        Log.info("bulk is {{t|round(places=2)}}x faster", t=single.duration.seconds / bulk.duration.seconds)
+
+    def test_concat_field(self):
+        schema = realistic_schema()
+        parents = ["." if i % 3 == 0 else "result.subtests" for i, _ in enumerate(schema)]
+        children = schema
+
+        with Timer("concat by split and join") as old_time:
+            old_result = [concat_field_using_join(p, c) for p, c in zip(parents, children)]
+
+        with Timer("concat by string") as new_time:
+            new_result = [concat_field(p, c) for p, c in zip(parents, children)]
+
+        self.assertEqual(new_result, old_result)
+        Log.info("concat is {{t|round(places=2)}}x faster", t=old_time.duration.seconds / new_time.duration.seconds)
+
+    def test_compiled_getter(self):
+        rows = [to_data({"run": {"machine": {"os": "linux" if i % 2 else None}}}) for i in range(100_000)]
+        getter = compile_getter("run.machine.os")
+
+        with Timer("Data.__getitem__") as item_time:
+            item_result = [r["run.machine.os"] for r in rows]
+
+        with Timer("compiled getter") as getter_time:
+            getter_result = [getter(r) for r in rows]
+
+        self.assertEqual(getter_result, item_result)
+        Log.info(
+            "compiled getter is {{t|round(places=2)}}x faster",
+            t=item_time.duration.seconds / getter_time.duration.seconds,
+        )
+
+    def test_compiled_setter(self):
+        paths = [f"enrich.{g}.{f}" for g in ["run", "task", "build"] for f in range(10)]
+        setters = [compile_setter(p) for p in paths]
+        num = 10_000
+
+        with Timer("Data.__setitem__") as item_time:
+            item_result = []
+            for i in range(num):
+                record = Data()
+                for p in paths:
+                    record[p] = i
+                item_result.append(record)
+
+        with Timer("compiled setter") as setter_time:
+            setter_result = []
+            for i in range(num):
+                record = Data()
+                for s in setters:
+                    s(record, i)
+                setter_result.append(record)
+
+        self.assertEqual(setter_result, item_result)
+        Log.info(
+            "compiled setter is {{t|round(places=2)}}x faster",
+            t=item_time.duration.seconds / setter_time.duration.seconds,
+        )
+
+    def test_projector(self):
+        paths = [f"run.machine.{f}" for f in ["os", "platform", "name", "cpu"]] + [
+            f"result.subtests.{i}.{f}" for i in range(3) for f in ["name", "status", "duration"]
+        ]
+        rows = [
+            {
+                "run": {"machine": {"os": "linux", "platform": "x64", "name": f"m{i}", "cpu": 4}},
+                "result": {"subtests": {str(j): {"name": "t", "status": "PASS", "duration": j} for j in range(3)}},
+            }
+            for i in range(20_000)
+        ]
+        project = projector(paths)
+
+        with Timer("one path at a time") as item_time:
+            item_result = [tuple(to_data(r)[p] for p in paths) for r in rows]
+
+        with Timer("projector") as project_time:
+            project_result = [project(r) for r in rows]
+
+        self.assertTrue(project_result == item_result)
+        Log.info(
+            "projector is {{t|round(places=2)}}x faster", t=item_time.duration.seconds / project_time.duration.seconds,
+        )
+
+    def test_select_paths(self):
+        rows = [
+            {
+                "run": {"machine": {"os": "linux", "platform": "x64", "name": f"m{i}", "cpu": 4}},
+                "result": {"subtests": {str(j): {"name": "t", "status": "PASS", "duration": j} for j in range(3)}},
+            }
+            for i in range(5_000)
+        ]
+
+        with Timer("filter leaves") as leaves_time:
+            leaves_result = [
+                [(p, v) for p, v in to_data(r).leaves() if p.startswith("result.") and p.endswith(".duration")]
+                for r in rows
+            ]
+
+        with Timer("select_paths") as select_time:
+            select_result = [list(select_paths(r, "result.**.duration")) for r in rows]
+
+        self.assertTrue(select_result == leaves_result)
+        Log.info(
+            "select_paths is {{t|round(places=2)}}x faster", t=leaves_time.duration.seconds / select_time.duration.seconds,
+        )
+
+    def test_read_only_miss(self):
+        rows = [{"run": {"machine": {"os": "linux"}}, "id": i} for i in range(100_000)]
+        paths = ["run.machine.cpu", "result.duration", "id"]
+
+        def scan(wrap):
+            tracemalloc.start()
+            with Timer("scan") as timer:
+                for r in rows:
+                    d = wrap(r)
+                    for p in paths:
+                        d[p]
+                    d.missing
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return timer, peak
+
+        data_time, data_peak = scan(to_data)
+        read_time, read_peak = scan(read_only)
+        Log.info(
+            "read_only is {{t|round(places=2)}}x faster, peak memory {{m}} vs {{n}}",
+            t=data_time.duration.seconds / read_time.duration.seconds,
+            m=read_peak,
+            n=data_peak,
+        )
+
+    def test_getdefault_misses(self):
+        class Thing:
+            def __init__(self):
+                self.a = 1
+
+        containers = [{"a": 1, "b": {"c": 2}}, Thing(), {1: "one"}, [{"a": 1}, {"b": 2}]] * 50_000
+        keys = ["x", "y", "a", "1"]
+        getdefault = mo_dots._getdefault
+
+        with Timer("try/except ladder") as ladder_time:
+            ladder_result = [getdefault_using_exceptions(c, k) for c in containers for k in keys]
+
+        with Timer("lookup by type") as typed_time:
+            typed_result = [getdefault(c, k) for c in containers for k in keys]
+
+        self.assertEqual(len(ladder_result), len(typed_result))
+        for l, t in zip(ladder_result[:400], typed_result[:400]):
+            self.assertTrue(from_data(l) == from_data(t))
+        Log.info(
+            "lookup by type is {{t|round(places=2)}}x faster",
+            t=ladder_time.duration.seconds / typed_time.duration.seconds,
+        )
+
+    def test_cursor(self):
+        rows = [{"run": {"machine": {"os": "linux", "name": f"m{i}"}}} for i in range(200_000)]
+
+        with Timer("new wrapper per hop") as data_time:
+            data_result = [to_data(r).run.machine.os for r in rows]
+
+        cursor = DataCursor()
+        with Timer("cursor") as cursor_time:
+            cursor_result = [cursor(r).run.machine.os for r in rows]
+
+        self.assertEqual(data_result, cursor_result)
+        Log.info(
+            "cursor is {{t|round(places=2)}}x faster", t=data_time.duration.seconds / cursor_time.duration.seconds,
+        )
+
+    def test_frozen_group_by(self):
+        rows = [
+            {"run": {"machine": {"os": "linux", "platform": f"p{i % 7}"}, "suite": f"s{i % 5}"}, "id": i}
+            for i in range(50_000)
+        ]
+        with Timer("group by tuples") as tuple_time:
+            tuple_groups = {}
+            for r in rows:
+                key = tuple(sorted(to_data(r["run"]).leaves()))
+                tuple_groups.setdefault(key, []).append(r["id"])
+            tuple_groups = sorted(tuple_groups.values())
+
+        with Timer("group by frozen") as frozen_time:
+            frozen_groups = {}
+            for r in rows:
+                frozen_groups.setdefault(freeze(r["run"]), []).append(r["id"])
+            frozen_groups = sorted(frozen_groups.values())
+
+        self.assertEqual(tuple_groups, frozen_groups)
+        Log.info(
+            "grouping by frozen is {{t|round(places=2)}}x faster",
+            t=tuple_time.duration.seconds / frozen_time.duration.seconds,
+        )
+
+    def test_hash_adversarial_keys(self):
+        # SAME LEADING FIELD IN EVERY RECORD
+        records = [{"type": "test", "run": {"id": i, "suite": "s"}} for i in range(1_000)]
+
+        with Timer("hash first value") as first_time:
+            first_set = set(HashedBy(r, hash_value_using_first) for r in records)
+
+        with Timer("structural hash") as structural_time:
+            structural_set = set(HashedBy(r, hash_value) for r in records)
+
+        self.assertEqual(len(first_set), len(structural_set))
+        Log.info(
+            "structural hash is {{t|round(places=2)}}x faster",
+            t=first_time.duration.seconds / structural_time.duration.seconds,
+        )
+
+    def test_data_eq(self):
+        def record(i, os):
+            return {"run": {"machine": {"os": os, "name": f"m{i}"}, "suite": "s", "chunk": i}, "id": i}
+
+        lefts = [to_data(record(i, "linux")) for i in range(50_000)]
+        rights = [to_data(record(i, "linux" if i % 2 else "win")) for i in range(50_000)]
+
+        with Timer("compare with get()") as get_time:
+            get_result = [data_eq_using_get(l, r) for l, r in zip(lefts, rights)]
+
+        with Timer("compare raw dicts") as raw_time:
+            raw_result = [l == r for l, r in zip(lefts, rights)]
+
+        self.assertEqual(get_result, raw_result)
+        Log.info(
+            "comparing raw dicts is {{t|round(places=2)}}x faster",
+            t=get_time.duration.seconds / raw_time.duration.seconds,
+        )
+
+    def test_record_class(self):
+        Run = record_class(["run.machine.os", "run.machine.name", "run.suite", "id"])
+        raws = [{"run": {"machine": {"os": "linux", "name": f"m{i}"}, "suite": "s"}, "id": i} for i in range(100_000)]
+
+        tracemalloc.start()
+        datas = [to_data(deepcopy(r)) for r in raws]
+        _, data_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        records = [Run(r) for r in raws]
+        _, record_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        with Timer("Data attribute access") as data_time:
+            data_result = [d.run.machine.os for d in datas]
+
+        with Timer("slot access") as record_time:
+            record_result = [r.run.machine.os for r in records]
+
+        self.assertEqual(data_result, record_result)
+        Log.info(
+            "record_class is {{t|round(places=2)}}x faster, and uses {{m|percent}} of the memory",
+            t=data_time.duration.seconds / record_time.duration.seconds,
+            m=record_peak / data_peak,
+        )
+        self.assertGreater(data_peak, record_peak)
+
+    def test_build_nested(self):
+        paths = [("run", "machine", f"os{i % 10}", f"name{i}", "value") for i in range(100_000)]
+
+        with Timer("assign by re-walking the path") as walk_time:
+            walk_result = {}
+            for i, path in enumerate(paths):
+                assign_to_null_using_recursion(walk_result, list(path), i)
+
+        with Timer("assign through flat Null") as flat_time:
+            flat_result = Data()
+            for i, (a, b, c, d, e) in enumerate(paths):
+                flat_result[a][b][c][d][e] = i
+
+        self.assertTrue(flat_result == walk_result)
+        Log.info(
+            "one-pass assignment is {{t|round(places=2)}}x faster",
+            t=walk_time.duration.seconds / flat_time.duration.seconds,
+        )
+
+    def test_accumulator(self):
+        events = [(f"os{i % 7}", f"suite{i % 13}", i % 5) for i in range(300_000)]
+
+        with Timer("count with +=") as iadd_time:
+            iadd_result = Data()
+            for os, suite, n in events:
+                iadd_result[os][suite] += n
+
+        with Timer("count with DataAccumulator") as acc_time:
+            acc = DataAccumulator()
+            for os, suite, n in events:
+                acc.add(Path((os, suite)), n)
+
+        self.assertTrue(acc.data == iadd_result)
+        Log.info(
+            "DataAccumulator is {{t|round(places=2)}}x faster",
+            t=iadd_time.duration.seconds / acc_time.duration.seconds,
+        )
+
+    def test_contains(self):
+        records = [
+            to_data({"run": {"machine": {"os": "linux" if i % 3 else ""}, "suite": "s"}, "id": i})
+            for i in range(100_000)
+        ]
+        keys = ["id", "missing", "run.machine.os", "run.machine.name", "run.missing.deeper"]
+
+        with Timer("contains through __getitem__") as getitem_time:
+            getitem_result = [[contains_using_getitem(r, k) for k in keys] for r in records]
+
+        with Timer("contains on raw dicts") as raw_time:
+            raw_result = [[k in r for k in keys] for r in records]
+
+        self.assertEqual(getitem_result, raw_result)
+        Log.info(
+            "raw __contains__ is {{t|round(places=2)}}x faster",
+            t=getitem_time.duration.seconds / raw_time.duration.seconds,
+        )
+
+
+def contains_using_getitem(self, item):
+    """
+    ORIGINAL Data.__contains__, BEFORE WALKING THE RAW dicts
+    """
+    value = Data.__getitem__(self, item)
+    if is_data(value) or value:
+        return True
+    return False
+
+
+def assign_to_null_using_recursion(obj, path, value):
+    """
+    ORIGINAL _assign_to_null, RE-WALKING THE PATH WITH get_attr AT EACH LEVEL
+    """
+    path0 = path[0]
+    if len(path) == 1:
+        obj[path0] = value
+        return
+
+    old_value = get_attr(obj, path0)
+    if is_null(old_value):
+        if is_null(value):
+            return
+        obj[path0] = {}
+        old_value = get_attr(obj, Path((path0,)))
+
+    assign_to_null_using_recursion(old_value, path[1:], value)
+
+
+def data_eq_using_get(self, other):
+    """
+    ORIGINAL Data.__eq__, BEFORE COMPARING RAW dicts
+    """
+    if self is other:
+        return True
+
+    d = from_data(self)
+    if not d and is_null(other):
+        return False
+
+    if not is_data(other):
+        return False
+    e = other
+    for k, v in d.items():
+        if e.get(k) != v:
+            return False
+    for k, v in e.items():
+        if d.get(k) != v:
+            return False
+    return True
+
+
+class HashedBy:
+    """
+    SET MEMBER WITH A GIVEN HASH FUNCTION, AND Data EQUALITY
+    """
+
+    __slots__ = ["value", "hash"]
+
+    def __init__(self, value, hasher):
+        self.value = to_data(value)
+        self.hash = hasher(value)
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def hash_value_using_first(v):
+    """
+    ORIGINAL hash_value, BEFORE STRUCTURAL HASH
+    """
+    if is_many(v):
+        return hash_value_using_first(first(v))
+    elif is_data(v):
+        return hash_value_using_first(first(v.values()))
+    else:
+        return hash(v)
+
+
+def getdefault_using_exceptions(obj, key):
+    """
+    ORIGINAL _getdefault, BEFORE CHOOSING THE LOOKUP BY TYPE
+    """
+    try:
+        return obj[key]
+    except Exception as f:
+        pass
+
+    if is_sequence(obj):
+        return [getdefault_using_exceptions(o, key) for o in obj]
+
+    try:
+        if obj.__class__ is not dict:
+            return getattr(obj, key)
+    except Exception as f:
+        pass
+
+    try:
+        if float(key) == round(float(key), 0):
+            return obj[int(key)]
+    except Exception as f:
+        pass
+
+    return NullType(obj, key)
+
+
+def concat_field_using_join(*fields):
+    """
+    ORIGINAL concat_field, BEFORE WORKING ON STRINGS
+    """
+    return join_field_using_regex([step for f in fields for step in split_field_using_regex(f)])
+
+
+def realistic_schema():
+    """
+    FIELD NAMES SHAPED LIKE A LARGE ELASTICSEARCH INDEX
+    """
+    words = [
+        "run",
+        "machine",
+        "os",
+        "platform",
+        "result",
+        "test",
+        "duration",
+        "start_time",
+        "subtests",
+        "name",
+        "status",
+        "task",
+        "build",
+        "branch",
+        "revision",
+        "action",
+        "etl",
+        "source",
+        "id",
+        "timestamp",
+    ]
+    output = set()
+    while len(output) < 5000:
+        output.add(".".join(randoms.sample(words, randoms.int(5) + 1)))
+    output.add("meta..stats.url")  # SOME ESCAPED FIELDS
+    output.add("run.\bbuild")
+    return sorted(output)
+
 
 def is_text(t):
     return t.__class__ is text
@@ -7,9 +7,13 @@
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
 
+from itertools import product
+
 from mo_testing.fuzzytestcase import FuzzyTestCase
 
 from mo_dots import *
+from mo_dots import fields
+from tests.reference_fields import split_field_using_regex, join_field_using_regex, literal_field_using_regex
 
 
 class TestFields(FuzzyTestCase):
@@ -88,7 +92,212 @@ class TestFields(FuzzyTestCase):
         self.assertEqual(join_field(parent + split_field("....a.b")), "a.b")
         self.assertEqual(join_field(parent + split_field(".....a.b")), "..a.b")
 
+    def test_tail_path(self):
+        first, rest = tail_path(parse_field("a.b..c.d"))
+        self.assertEqual(first, "a")
+        self.assertIsInstance(rest, Path)
+        self.assertTrue(rest == ("b.c", "d"))
+        first, rest = tail_path(rest)
+        self.assertTrue((first, rest) == ("b.c", ("d",)))
+        self.assertTrue(tail_path(Path()) == (None, ()))
+
+    def test_relative_path(self):
+        self.assertTrue(relative_path(("a", "b", "c"), ()) == ("a", "b", "c"))
+        self.assertTrue(relative_path(("a", "b", "c"), ("a",)) == ("b", "c"))
+        self.assertTrue(relative_path(("a", "b", "c"), ("a", "b", "c")) == ())
+        self.assertTrue(relative_path(("a", "b", "c", "k"), ("a", "b", "c", "d", "e")) == ("..", "..", "k"))
+        fields = ["a", "a.b", "a.b.c", "a.x", "x.b..c", "a.b.c.k", "."]
+        for field, parent in product(fields, fields):
+            self.assertEqual(
+                join_field(relative_path(parse_field(field), parse_field(parent))),
+                relative_field(field, parent),
+                msg=f"{field} relative to {parent}",
+            )
+
     def test_tail_field(self):
         a, b = tail_field("g..a")
         self.assertEqual(a, "g..a")
-        self.assertEqual(b, ".")
\ No newline at end of file
+        self.assertEqual(b, ".")
+
+    def test_parse_field_is_cached(self):
+        set_field_cache_size()
+        first = parse_field("a.b..c")
+        self.assertEqual(first, ("a", "b.c"))
+        self.assertIs(parse_field("a.b..c"), first)
+
+        stats = field_cache_stats()["split"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+        # split_field RETURNS A COPY, SO THE CACHE IS NOT POLLUTED
+        copy = split_field("a.b..c")
+        copy.append("d")
+        self.assertEqual(parse_field("a.b..c"), ("a", "b.c"))
+
+    def test_field_cache_is_bounded(self):
+        set_field_cache_size(2)
+        try:
+            for f in ["a", "b", "c", "a.b", "a.c"]:
+                parse_field(f)
+            stats = field_cache_stats()["split"]
+            self.assertEqual(stats["size"], 2)
+            self.assertEqual(stats["misses"], 5)
+        finally:
+            set_field_cache_size()
+
+    def test_zero_field_cache_size(self):
+        set_field_cache_size(0)
+        try:
+            self.assertEqual(literal_field("a.b"), "a..b")
+            self.assertEqual(unliteral_field("a..b"), "a.b")
+            self.assertEqual(parse_field("a.b..c"), ("a", "b.c"))
+            stats = field_cache_stats()
+            self.assertEqual(stats["literal"]["size"], 0)
+            self.assertEqual(stats["unliteral"]["size"], 0)
+            self.assertEqual(stats["split"]["size"], 0)
+        finally:
+            set_field_cache_size()
+
+    def test_illegal_field_not_cached(self):
+        set_field_cache_size()
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                parse_field("a...b")
+        self.assertEqual(field_cache_stats()["split"]["size"], 0)
+
+    def test_path_is_parsed_once(self):
+        path = Path("a.b..c")
+        self.assertEqual(path, ("a", "b.c"))
+        self.assertIs(Path(path), path)
+        self.assertEqual(str(path), "a.b..c")
+        self.assertEqual(repr(path), "Path('a.b..c')")
+        self.assertEqual(hash(path), hash(Path("a.b..c")))
+        self.assertEqual(Path(["a", "b.c"]), path)
+
+    def test_path_access(self):
+        path = Path("a.b..c")
+        data = Data()
+        data[path] = 42
+        self.assertEqual(data, {"a": {"b.c": 42}})
+        self.assertEqual(data[path], 42)
+        self.assertEqual(data["a.b..c"], 42)
+        self.assertEqual(get_attr(data, path), 42)
+        self.assertEqual(to_data([data, data]).get(path), [42, 42])
+        self.assertEqual(data.pop(path), 42)
+        self.assertEqual(data, {"a": {}})
+
+        set_attr(data, path, 7)
+        self.assertEqual(data, {"a": {"b.c": 7}})
+        del data[path]
+        self.assertEqual(data, {"a": {}})
+
+    def test_path_through_null(self):
+        data = Data()
+        data.x[Path("a.b..c")] = 42
+        self.assertEqual(data, {"x": {"a": {"b.c": 42}}})
+        self.assertEqual(Null[Path("a.b")], None)
+
+    def test_root_path(self):
+        data = to_data({"a": 1})
+        self.assertIs(data[Path(".")], data)
+        self.assertIs(data[Path()], data)
+
+    def test_scanner_matches_regex(self):
+        for n in range(1, 7):
+            for chars in product("a.\b", repeat=n):
+                field = "".join(chars)
+                try:
+                    expected = split_field_using_regex(field)
+                except Exception:
+                    with self.assertRaises(Exception):
+                        fields._split(field)
+                    continue
+                self.assertEqual(list(fields._split(field)), expected, msg=repr(field))
+                self.assertEqual(join_field(expected), join_field_using_regex(expected), msg=repr(field))
+                self.assertEqual(literal_field(field), literal_field_using_regex(field), msg=repr(field))
+
+    def test_bulk_fields(self):
+        plain = ["a.b", "a.c", ".d", "e"]
+        escaped = plain + ["meta..stats", "x.\by", "...up"]
+        for fields in [plain, escaped]:
+            self.assertEqual(split_fields(fields), [split_field(f) for f in fields])
+
+        paths = [["a", "b"], ("a.b", "c"), [], ["..", "a"], ["x", "..", "y"], ["a.", "b"]]
+        self.assertEqual(join_fields(paths), [join_field(p) for p in paths])
+
+        for prefix in [".", "a", "a.b", "..", "..a", "a..b"]:
+            children = [".", "c", ".c", "..c", "...c", "c..d", "c.d"]
+            self.assertEqual(
+                concat_fields(prefix, children), [concat_field(prefix, c) for c in children], msg=prefix
+            )
+
+    def test_field_index(self):
+        words = ["a", "b", "ab", "c.d"]
+        fields = sorted({join_field(p) for n in range(1, 4) for p in product(words, repeat=n)})
+        # \b IS AN ESCAPED DOT, SO THESE ARE COMPARED AS STRINGS BY startswith_field
+        fields += ["b.\bx", "b\bx", "b\bx.y", "y.x\bb", "y.x\b\bb"]
+        index = FieldIndex(fields)
+        self.assertEqual(len(index), len(fields))
+        self.assertIn("c..d.a", index)
+        self.assertNotIn("c.d", index)
+        self.assertNotIn("b.\bx", index.descendants("b"))
+        self.assertIn("b\bx", index.descendants("b"))
+
+        for query in fields + [".", "x", "a.x", "b", "b\bx", "bb"]:
+            self.assertEqual(
+                sorted(index.descendants(query)), sorted(f for f in fields if startswith_field(f, query)), msg=query
+            )
+            self.assertEqual(
+                sorted(index.endswith(query)), sorted(f for f in fields if endswith_field(f, query)), msg=query
+            )
+            self.assertEqual(
+                index.relative(query),
+                {f: relative_field(f, query) for f in fields if startswith_field(f, query)},
+                msg=query,
+            )
+
+    def test_concat_field_matches_join(self):
+        def expected(*fields):
+            return join_field([step for f in fields for step in split_field(f)])
+
+        samples = ["".join(chars) for n in range(0, 5) for chars in product("a.\b", repeat=n)]
+        samples = [f for f in samples if f]
+        parents = ["a.b.c", "a..b.c", "x.\by", "..a", "."]
+        for parent in parents:
+            for field in samples:
+                for args in [(field,), (parent, field), (field, parent), (parent, field, "..z")]:
+                    try:
+                        result = expected(*args)
+                    except Exception:
+                        with self.assertRaises(Exception):
+                            concat_field(*args)
+                        continue
+                    self.assertEqual(concat_field(*args), result, msg=repr(args))
+
+    def test_literal_field_is_interned(self):
+        set_field_cache_size()
+        a = "".join(["a", ".", "b"])
+        b = "".join(["a", ".", "b"])
+        self.assertIsNot(a, b)
+        self.assertIs(literal_field(a), literal_field(b))
+        self.assertEqual(literal_field(a), "a..b")
+
+        plain_a = "".join(["x", "y"])
+        plain_b = "".join(["x", "y"])
+        self.assertIs(literal_field(plain_b), literal_field(plain_a))
+        self.assertIs(unliteral_field("a..b"), unliteral_field("".join(["a", "..", "b"])))
+
+        stats = field_cache_stats()
+        self.assertEqual(stats["literal"]["size"], 2)
+        self.assertGreater(stats["literal"]["memory"], 0)
+        self.assertEqual(stats["unliteral"]["size"], 1)
+
+    def test_literal_field_is_bounded(self):
+        set_field_cache_size(10)
+        try:
+            for i in range(100):
+                literal_field(f"a.{i}")
+            self.assertLessEqual(field_cache_stats()["literal"]["size"], 10)
+            self.assertEqual(literal_field("a.99"), "a..99")
+        finally:
+            set_field_cache_size()
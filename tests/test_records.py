@@ -0,0 +1,206 @@
+# encoding: utf-8
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import copy
+import json
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_dots import *
+from mo_dots import utils
+
+SAMPLE = {"run": {"machine": {"os": "linux", "a.b": 1}, "suite": "mochitest"}, "tags": [1, 2]}
+
+
+class TestRecords(FuzzyTestCase):
+    def test_path_table(self):
+        table = PathTable()
+        a = table.id("run.machine.os")
+        b = table.id("a..b")
+        self.assertEqual(table.id(Path("run.machine.os")), a)
+        self.assertEqual(table.id(("a.b",)), b)
+        self.assertEqual(table.field(b), "a..b")
+        self.assertTrue(table.path(a) == ("run", "machine", "os"))
+        self.assertEqual(table.lookup("not.here"), None)
+        self.assertEqual(len(table), 2)
+        self.assertIn("a..b", table)
+
+    def test_shape_is_shared(self):
+        table = PathTable()
+        a = Record(SAMPLE, table)
+        b = Record({"tags": [3], "run": {"suite": "web", "machine": {"a.b": 2, "os": "win"}}}, table)
+        self.assertIs(a.shape, b.shape)
+        self.assertIs(table.shape([2, 0, 1]), table.shape((0, 1, 2)))
+        self.assertNotEqual(a, b)
+        b["run.machine.os"] = "linux"
+        b["run.machine.a..b"] = 1
+        b.run = {"machine": {"os": "linux", "a.b": 1}, "suite": "mochitest"}
+        b.tags = [1, 2]
+        self.assertIs(a.shape, b.shape)
+        self.assertTrue(a == b)
+        self.assertEqual(hash(a), hash(b))
+
+    def test_data_api(self):
+        r = Record(SAMPLE)
+        self.assertEqual(r.run.machine.os, "linux")
+        self.assertEqual(r["run.machine.a..b"], 1)
+        self.assertEqual(r["run.machine"], {"os": "linux", "a.b": 1})
+        self.assertTrue(is_data(r.run))
+        self.assertEqual(r.tags, [1, 2])
+        self.assertEqual(r.keys(), {"run", "tags"})
+        self.assertEqual(len(r), 2)
+        self.assertIn("run.suite", r)
+        self.assertNotIn("run.nothing", r)
+        self.assertEqual(r.nothing, None)
+        self.assertEqual(r.get("nothing", 42), 42)
+        self.assertTrue(r == SAMPLE)
+        self.assertTrue(r.to_dict() == SAMPLE)
+        self.assertEqual(sorted(r.leaves()), sorted(to_data(SAMPLE).leaves()))
+
+    def test_assignment(self):
+        r = Record(SAMPLE)
+        r["run.machine"] = 42
+        self.assertTrue(r.to_dict() == {"run": {"machine": 42, "suite": "mochitest"}, "tags": [1, 2]})
+        r["run.machine.os"] = "win"
+        self.assertTrue(r.to_dict() == {"run": {"machine": {"os": "win"}, "suite": "mochitest"}, "tags": [1, 2]})
+        del r.run
+        self.assertTrue(r.to_dict() == {"tags": [1, 2]})
+        self.assertEqual(r.pop("tags"), [1, 2])
+        self.assertTrue(r.to_dict() == {})
+
+    def test_inner_objects_write_through(self):
+        r = Record(SAMPLE)
+        machine = r.run.machine
+        r.run.machine.os = "win"
+        self.assertEqual(r["run.machine.os"], "win")
+        self.assertEqual(machine.os, "win")
+        machine["a..b"] = 2
+        self.assertTrue(r.to_dict() == {"run": {"machine": {"os": "win", "a.b": 2}, "suite": "mochitest"}, "tags": [1, 2]})
+        self.assertEqual(r.run.keys(), {"machine", "suite"})
+        self.assertEqual(sorted(r.run.leaves()), [("machine.a..b", 2), ("machine.os", "win"), ("suite", "mochitest")])
+        self.assertEqual(r.run.pop("suite"), "mochitest")
+        self.assertTrue(r.to_dict() == {"run": {"machine": {"os": "win", "a.b": 2}}, "tags": [1, 2]})
+
+    def test_assign_to_missing_branch(self):
+        r = Record({"id": 1})
+        r.x.y = 1
+        r.run.machine.os = "linux"
+        self.assertTrue(r.to_dict() == {"id": 1, "x": {"y": 1}, "run": {"machine": {"os": "linux"}}})
+        r.x.z.w = 2
+        self.assertTrue(r.to_dict() == {"id": 1, "x": {"y": 1, "z": {"w": 2}}, "run": {"machine": {"os": "linux"}}})
+
+    def test_list_leaves_fan_out(self):
+        raw = {"a": [{"b": 1}, {"b": 2}], "c": {"d": [{"e": 3}]}}
+        r = Record(raw)
+        self.assertTrue(r["a.b"] == to_data(raw)["a.b"])
+        self.assertEqual(r["a.b"], [1, 2])
+        self.assertEqual(r.c["d.e"], [3])
+        self.assertEqual(r["a.x"], to_data(raw)["a.x"])
+
+    def test_empty_object_is_kept(self):
+        r = Record({"a": {}, "b": 1})
+        self.assertEqual(r.keys(), {"a", "b"})
+        self.assertTrue(r.to_dict() == {"a": {}, "b": 1})
+        self.assertIn("a", r)
+        r.a.c = 2
+        self.assertTrue(r.to_dict() == {"a": {"c": 2}, "b": 1})
+        r.d = {}
+        self.assertTrue(r.to_dict() == {"a": {"c": 2}, "b": 1, "d": {}})
+
+    def test_copy(self):
+        r = Record({"a": {"b": 1}, "l": [1, 2]})
+        c = copy.copy(r)
+        self.assertTrue(c == r)
+        c.a.b = 2
+        self.assertEqual(r.a.b, 1)
+        d = copy.deepcopy(r)
+        self.assertIsInstance(d, Record)
+        self.assertTrue(d.to_dict() == {"a": {"b": 1}, "l": [1, 2]})
+        d.l.append(3)
+        self.assertEqual(r.l, [1, 2])
+        v = copy.deepcopy(r.a)
+        v.b = 3
+        self.assertEqual(r.a.b, 1)
+        self.assertFalse(hasattr(r, "__missing_dunder__"))
+        self.assertFalse(hasattr(r.a, "__missing_dunder__"))
+
+    def test_hash_matches_eq(self):
+        r = Record({"a": {"b": 1}, "c": "x"})
+        d = to_data({"a": {"b": 1}, "c": "x"})
+        self.assertTrue(r == d)
+        self.assertEqual(hash(r), hash(d))
+        self.assertIn(d, {r})
+        self.assertEqual(hash(r.a), hash(d.a))
+
+    def test_non_string_keys(self):
+        r = Record({"1": "x", "a": {"2": "y"}})
+        self.assertEqual(r[1], "x")
+        self.assertEqual(r.a[2], "y")
+        self.assertIsInstance(r[3], NullType)
+        r[4] = "z"
+        self.assertEqual(r["4"], "z")
+
+    def test_json_round_trip(self):
+        Run = record_class(["run.machine.os", "run.machine.a..b", "run.suite", "tags"])
+        for r in (Record(SAMPLE), Run(SAMPLE)):
+            self.assertTrue(json.loads(json.dumps(r, default=from_data)) == SAMPLE)
+            self.assertTrue(json.loads(json.dumps(r.run, default=from_data)) == SAMPLE["run"])
+            self.assertIs(type(from_data(r)), dict)
+            self.assertEqual(sorted(to_data({"r": r}).leaves()), sorted(to_data({"r": SAMPLE}).leaves()))
+
+    def test_record_class(self):
+        Run = record_class(["run.machine.os", "run.machine.a..b", "run.suite", "tags", "class"], "Run")
+        r = Run(SAMPLE, **{"class": "c"})
+        self.assertIsInstance(r, SlotRecord)
+        self.assertEqual(r.run.machine.os, "linux")
+        self.assertEqual(r["run.machine.a..b"], 1)
+        self.assertEqual(r["class"], "c")
+        self.assertEqual(r.tags, [1, 2])
+        self.assertIsInstance(r.run, SlotRecord)
+        self.assertIs(type(r.run), Run._children["run"])
+        self.assertIsInstance(r.nothing, NullType)
+        self.assertEqual(r.get("run.nothing", 42), 42)
+        self.assertTrue(r == {**SAMPLE, "class": "c"})
+        self.assertTrue(to_data({**SAMPLE, "class": "c"}) == r.to_dict())
+        self.assertEqual(sorted(r.leaves()), sorted(to_data({**SAMPLE, "class": "c"}).leaves()))
+        self.assertEqual(r.keys(), {"run", "tags", "class"})
+        self.assertIn("run.suite", r)
+        self.assertNotIn("run.nothing", r)
+
+    def test_record_class_wraps_leaf_values(self):
+        Doc = record_class(["meta", "tags", "id"], "Doc")
+        d = Doc({"meta": {"k": {"v": 1}}, "tags": [{"a": 1}, {"a": 2}], "id": 3})
+        self.assertEqual(d.meta.k.v, 1)
+        self.assertEqual(d.meta.k.v, d["meta.k.v"])
+        self.assertIsInstance(d.meta, Data)
+        self.assertIsInstance(d.tags, FlatList)
+        self.assertEqual(d.tags.get("a"), [1, 2])
+        d.meta.k.w = 2
+        self.assertTrue(d.to_dict() == {"meta": {"k": {"v": 1, "w": 2}}, "tags": [{"a": 1}, {"a": 2}], "id": 3})
+        self.assertIs(type(d.to_dict()["meta"]), dict)
+        self.assertIs(type(d.to_dict()["tags"]), list)
+
+    def test_record_classes_are_data_without_registering(self):
+        before = len(utils._data_types)
+        Run = record_class(["a.b", "c"])
+        self.assertEqual(len(utils._data_types), before)
+        self.assertTrue(is_data(Run(c=1)))
+        self.assertTrue(is_data(Run({"a": {"b": 1}}).a))
+        self.assertFalse(is_data([]))
+
+    def test_record_class_assignment(self):
+        Run = record_class({"run": {"machine": {"os": str}, "suite": str}, "id": int})
+        r = Run(id=1)
+        r.run.machine.os = "win"
+        r["run.suite"] = "s"
+        self.assertTrue(r.to_dict() == {"run": {"machine": {"os": "win"}, "suite": "s"}, "id": 1})
+        r.id = None
+        del r["run.machine"]
+        self.assertTrue(r.to_dict() == {"run": {"suite": "s"}})
+        with self.assertRaises(Exception):
+            r.not_in_schema = 1
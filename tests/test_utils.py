@@ -6,6 +6,9 @@
 #
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
+import gc
+import weakref
+
 from mo_dots import utils, logging, datas
 from mo_testing.fuzzytestcase import FuzzyTestCase
 
@@ -32,7 +35,37 @@ class TestUtils(FuzzyTestCase):
         self.assertEqual(exists(None), False)
 
     def test_hash_value(self):
-        self.assertEqual(hash_value(["a"]), hash("a"))
+        self.assertEqual(hash_value(["a"]), hash_value(("a",)))
+        self.assertEqual(hash_value(["a"]), hash_value(to_data(["a"])))
+        self.assertNotEqual(hash_value(["a", "b"]), hash_value(["a", "c"]))
+        self.assertNotEqual(hash_value(["a", "b"]), hash_value(["b", "a"]))
+
+    def test_hash_value_matches_eq(self):
+        samples = [
+            ({"a": 1, "b": {"c": [1, 2]}}, to_data({"b": {"c": [1, 2]}, "a": 1})),
+            ({"a": 1, "b": None}, {"a": 1}),
+            ({"a": {1, 2}}, {"a": {2, 1}}),
+            ({"a": freeze({"b": 1})}, {"a": {"b": 1}}),
+            ({str(i): i for i in range(100)}, {str(i): i for i in reversed(range(100))}),
+            (list(range(100)), to_data(list(range(100)))),
+            ({"a": []}, {}),
+            ({"a": ""}, {}),
+            ({"a": {}, "b": {"c": None}}, {}),
+            ({"a": [], "b": 1}, {"a": None, "b": 1}),
+        ]
+        for a, b in samples:
+            self.assertTrue(to_data(a) == b)
+            self.assertEqual(hash_value(a), hash_value(b))
+            self.assertEqual(hash_value(a, full=True), hash_value(b, full=True))
+            self.assertEqual(hash(to_data(a)), hash(to_data(b)))
+
+    def test_hash_value_uses_more_than_first(self):
+        records = [{"type": "same", "id": i} for i in range(100)]
+        self.assertEqual(len(set(hash_value(r) for r in records)), 100)
+        wide = [{**{f"k{j}": 0 for j in range(100)}, "id": i} for i in range(100)]
+        self.assertEqual(len(set(hash_value(r, full=True) for r in wide)), 100)
+        rows = [[0] * 100 + [i] for i in range(100)]
+        self.assertEqual(len(set(hash_value(r, full=True) for r in rows)), 100)
 
     def test_set_default(self):
         x = set_default({"a": 1}, None)
@@ -83,3 +116,67 @@ class TestUtils(FuzzyTestCase):
         self.assertGreater(len(result), 1)
         result = list(datas._data_types)
         self.assertGreater(len(result), 1)
+
+    def test_type_dispatch_follows_registration(self):
+        class Late:
+            pass
+
+        class Nothing:
+            pass
+
+        self.addCleanup(_restore_registries, utils._known_data_types, utils._null_types)
+        late = Late()
+        self.assertIs(object_to_data(late), late)
+        register_type(Late)
+        self.assertIsInstance(object_to_data(late), DataObject)
+
+        data = to_data({"a": Nothing()})
+        self.assertIsInstance(data.a, Nothing)
+        utils.register_null_type(Nothing)
+        self.assertIsInstance(data.a, NullType)
+
+    def test_type_dispatch_classifies_once(self):
+        calls = []
+
+        def classify(type_):
+            calls.append(type_)
+            return type_.__name__
+
+        table = utils.TypeDispatch(classify)
+        self.assertEqual(table[int], "int")
+        self.assertEqual(table[int], "int")
+        self.assertEqual(calls, [int])
+        utils._clear_dispatch()
+        self.assertEqual(table[int], "int")
+        self.assertEqual(calls, [int, int])
+
+    def test_type_dispatch_is_not_held(self):
+        table = utils.TypeDispatch(str)
+        self.assertIn(table, [r() for r in utils._dispatchers])
+        size = len(utils._dispatchers)
+        ref = weakref.ref(table)
+        del table
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(utils._dispatchers), size - 1)
+
+    def test_type_dispatch_is_bounded(self):
+        table = utils.TypeDispatch(str)
+        Run = record_class(["a"])
+        ref = weakref.ref(Run)
+        self.assertTrue(is_data(Run(a=1)))
+        table[Run]
+        del Run
+        for i in range(utils.MAX_DISPATCH_SIZE):
+            other = type(f"T{i}", (), {})
+            table[other]
+            self.assertFalse(is_data(other()))
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertLessEqual(len(table), utils.MAX_DISPATCH_SIZE)
+
+
+def _restore_registries(known_data_types, null_types):
+    utils._known_data_types = known_data_types
+    utils._null_types = null_types
+    utils._clear_dispatch()